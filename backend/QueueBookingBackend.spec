@@ -6,11 +6,12 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('app', 'app')],
-    hiddenimports=['uvicorn.logging', 'uvicorn.loops', 'uvicorn.loops.auto', 'uvicorn.protocols', 'uvicorn.protocols.http', 'uvicorn.protocols.http.auto', 'uvicorn.protocols.websockets', 'uvicorn.protocols.websockets.auto', 'uvicorn.lifespan', 'uvicorn.lifespan.on'],
+    # run_backend.py ใช้ ws="none" จึงไม่ต้องรวม websockets; passlib โหลด bcrypt handler แบบ dynamic
+    hiddenimports=['uvicorn.logging', 'uvicorn.loops', 'uvicorn.loops.auto', 'uvicorn.loops.asyncio', 'uvicorn.loops.uvloop', 'uvicorn.protocols', 'uvicorn.protocols.http', 'uvicorn.protocols.http.auto', 'uvicorn.protocols.http.h11_impl', 'uvicorn.protocols.http.httptools_impl', 'uvicorn.lifespan', 'uvicorn.lifespan.on', 'passlib.handlers.bcrypt', 'orjson'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['websockets', 'wsproto'],
     noarchive=False,
 )
 pyz = PYZ(a.pure)
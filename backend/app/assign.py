@@ -0,0 +1,87 @@
+"""เลือกพนักงานให้อัตโนมัติเมื่อลูกค้าจองแบบ "พนักงานคนไหนก็ได้"
+
+ผู้เรียกล็อกพนักงาน/วันของผู้สมัครทุกคนก่อน (lock_staff_days) แล้วสร้าง StaffDay จากคิวและการกัน
+ที่อ่านภายใต้ล็อก การเลือกจึงเป็นข้อมูลล่าสุดและไม่มีคำขออื่นแทรกได้จนกว่าจะ commit
+กลยุทธ์ทั้งหมดคำนวณจาก StaffDay ในหน่วยความจำ ไม่ query เพิ่ม
+"""
+import threading
+from datetime import time
+from typing import Callable, Dict, List, Optional
+from .slots import Interval, merge_intervals
+
+def _minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+class StaffDay:
+    """ช่วงทำงานและช่วงที่ไม่ว่าง (เรียงและรวมแล้ว) ของพนักงานหนึ่งคนในหนึ่งวัน"""
+
+    def __init__(self, staff_id: int, open_time: time, close_time: time, busy: List[Interval]):
+        self.staff_id = staff_id
+        self.open_time = open_time
+        self.close_time = close_time
+        self.busy = merge_intervals(busy)
+
+    def is_free(self, start: time, end: time) -> bool:
+        if not (self.open_time <= start and end <= self.close_time):
+            return False
+        return not any(s < end and start < e for s, e in self.busy)
+
+    def busy_minutes(self) -> int:
+        return sum(_minutes(e) - _minutes(s) for s, e in self.busy)
+
+    def gaps_with(self, start: time, end: time) -> int:
+        """จำนวนช่วงว่างในวันทำงานถ้าเพิ่มคิว [start, end) เข้าไป (น้อย = ตารางแน่นต่อเนื่อง)"""
+        gaps = 0
+        cursor = self.open_time
+        for s, e in merge_intervals(self.busy + [(start, end)]):
+            if s > cursor:
+                gaps += 1
+            cursor = max(cursor, e)
+        return gaps + (1 if cursor < self.close_time else 0)
+
+Strategy = Callable[[List[StaffDay], time, time, int], StaffDay]
+
+def least_loaded(free: List[StaffDay], start: time, end: time, service_id: int) -> StaffDay:
+    """คนที่มีคิวรวม (นาที) น้อยที่สุดในวันนั้น"""
+    return min(free, key=lambda sd: (sd.busy_minutes(), sd.staff_id))
+
+def fewest_gaps(free: List[StaffDay], start: time, end: time, service_id: int) -> StaffDay:
+    """คนที่รับคิวนี้แล้วตารางเหลือช่วงว่างกระจัดกระจายน้อยที่สุด (เก็บช่วงยาวไว้ให้คิวถัดไป)"""
+    return min(free, key=lambda sd: (sd.gaps_with(start, end), sd.busy_minutes(), sd.staff_id))
+
+class RoundRobin:
+    """วนตามลำดับ staff_id แยกตามบริการ (สถานะอยู่ในหน่วยความจำของแต่ละ process)"""
+
+    def __init__(self):
+        self._last: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, free: List[StaffDay], start: time, end: time, service_id: int) -> StaffDay:
+        ordered = sorted(free, key=lambda sd: sd.staff_id)
+        with self._lock:
+            last = self._last.get(service_id)
+            chosen = next((sd for sd in ordered if last is None or sd.staff_id > last), ordered[0])
+            self._last[service_id] = chosen.staff_id
+        return chosen
+
+STRATEGIES: Dict[str, Strategy] = {
+    "least_loaded": least_loaded,
+    "round_robin": RoundRobin(),
+    "fewest_gaps": fewest_gaps,
+}
+
+def choose_staff(
+    strategy: str, staff_days: List[StaffDay], start: time, end: time, service_id: int
+) -> Optional[StaffDay]:
+    """คืนพนักงานที่ว่างช่วง [start, end) ตามกลยุทธ์ หรือ None ถ้าไม่มีใครว่าง"""
+    free = [sd for sd in staff_days if sd.is_free(start, end)]
+    if not free:
+        return None
+    return STRATEGIES[strategy](free, start, end, service_id)
+
+def build_staff_days(schedules, appointments, holds) -> List[StaffDay]:
+    """schedules: StaffSchedule ของวันนั้น, appointments/holds: อะไรก็ได้ที่มี staff_id, start_time, end_time"""
+    busy: Dict[int, List[Interval]] = {}
+    for row in list(appointments) + list(holds):
+        busy.setdefault(row.staff_id, []).append((row.start_time, row.end_time))
+    return [StaffDay(sc.staff_id, sc.open_time, sc.close_time, busy.get(sc.staff_id, [])) for sc in schedules]
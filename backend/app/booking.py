@@ -0,0 +1,129 @@
+from datetime import date, datetime, time
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from .models import Appointment, SlotHold, StaffDayLock
+
+def _upsert_lock_rows(session: Session, rows: List[dict]) -> bool:
+    """INSERT แถวล็อกแบบไม่ error เมื่อมีอยู่แล้ว คืน False ถ้าฐานข้อมูลนี้ไม่รองรับ"""
+    dialect = session.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(StaffDayLock).values(rows)
+        stmt = stmt.on_duplicate_key_update(staff_id=stmt.inserted.staff_id)
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(StaffDayLock).values(rows).on_conflict_do_nothing()
+    else:
+        return False
+    with session.begin_nested():
+        session.execute(stmt)
+    return True
+
+def _insert_lock_rows(session: Session, keys: List[Tuple[int, date]]):
+    """สร้างแถวล็อกที่ยังไม่มี (ผู้เรียกส่ง keys ที่เรียงแล้ว)
+
+    MySQL ใช้ INSERT ... ON DUPLICATE KEY UPDATE ซึ่งได้ exclusive lock ของแถวตามลำดับ keys ทันที
+    (INSERT ธรรมดาที่ชน duplicate key ทิ้ง shared lock ไว้แม้ rollback savepoint แล้ว
+    สองคำขอที่แข่งกันสร้างแถวแรกจึง deadlock กันตอน SELECT ... FOR UPDATE)
+    """
+    rows = [{"staff_id": staff_id, "date": d} for staff_id, d in keys]
+    try:
+        if _upsert_lock_rows(session, rows):
+            return
+    except IntegrityError:
+        # มี staff_id ที่ไม่มีอยู่จริง: ทำทีละแถวเพื่อข้ามเฉพาะแถวนั้น
+        pass
+    for row in rows:
+        try:
+            if not _upsert_lock_rows(session, [row]):
+                with session.begin_nested():
+                    session.add(StaffDayLock(**row))
+        except IntegrityError:
+            pass
+
+def lock_staff_day(session: Session, staff_id: int, d: date) -> Optional[StaffDayLock]:
+    """ล็อกตารางของพนักงานในวันนั้นจนกว่า transaction จะ commit/rollback
+
+    คำขอจองของพนักงาน/วันเดียวกันจะรอคิวกันที่แถวนี้ ส่วนพนักงานหรือวันอื่นไม่ถูกบล็อก
+    คืนค่า None ถ้าสร้างแถวล็อกไม่ได้ (เช่น ไม่มีพนักงานคนนี้)
+    """
+    _insert_lock_rows(session, [(staff_id, d)])
+    stmt = select(StaffDayLock).where(StaffDayLock.staff_id == staff_id, StaffDayLock.date == d)
+    return session.exec(stmt.with_for_update()).first()
+
+# จำนวนคู่ (staff_id, date) ต่อหนึ่ง query ของ lock_staff_days
+LOCK_CHUNK_SIZE = 200
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def lock_staff_days(session: Session, keys: Iterable[Tuple[int, date]]) -> Set[Tuple[int, date]]:
+    """lock_staff_day หลายคู่ในคราวเดียว (ใช้ตอนนำเข้าคิวจำนวนมาก)
+
+    ล็อกตามลำดับ (staff_id, date) เสมอ สอง transaction ที่ล็อกหลายวันพร้อมกันจึงไม่ deadlock กันเอง
+    คืนชุด (staff_id, date) ที่ล็อกได้ คู่ที่ไม่อยู่ในผลลัพธ์คือพนักงานที่ไม่มีอยู่จริง
+    """
+    keys = sorted(set(keys))
+    # upsert ทุกคู่ (ไม่ใช่เฉพาะที่ยังไม่มี) เพื่อให้ได้ล็อกตามลำดับ keys ตั้งแต่แถวแรก
+    for chunk in _chunks(keys, LOCK_CHUNK_SIZE):
+        _insert_lock_rows(session, chunk)
+
+    locked: Set[Tuple[int, date]] = set()
+    for chunk in _chunks(keys, LOCK_CHUNK_SIZE):
+        locked.update(session.exec(
+            select(StaffDayLock.staff_id, StaffDayLock.date).where(
+                tuple_(StaffDayLock.staff_id, StaffDayLock.date).in_(chunk)
+            ).order_by(StaffDayLock.staff_id, StaffDayLock.date).with_for_update()
+        ).all())
+    return locked
+
+def staff_day_appointments(session: Session, keys: List[Tuple[int, date]]) -> list:
+    """คิวทั้งหมด (รวมที่ยกเลิก) ของคู่ (staff_id, date) ที่ล็อกไว้ แบบ locking read เหมือน has_conflict
+
+    คืนเฉพาะคอลัมน์ที่ใช้เช็คคิวซ้ำ/ทับซ้อน: (staff_id, date, start_time, end_time, service_id, status)
+    """
+    rows = []
+    for chunk in _chunks(sorted(keys), LOCK_CHUNK_SIZE):
+        rows.extend(session.exec(
+            select(
+                Appointment.staff_id, Appointment.date, Appointment.start_time,
+                Appointment.end_time, Appointment.service_id, Appointment.status
+            ).where(
+                tuple_(Appointment.staff_id, Appointment.date).in_(chunk)
+            ).with_for_update()
+        ).all())
+    return rows
+
+def has_conflict(
+    session: Session, staff_id: int, d: date, start: time, end: time, ignore_hold: Optional[str] = None
+) -> bool:
+    """มีคิวที่ยังไม่ถูกยกเลิก หรือการกันช่วงเวลาที่ยังไม่หมดอายุ ของพนักงานคนนี้ทับช่วง [start, end) หรือไม่
+
+    ignore_hold คือ token ของการกันที่ผู้จองถืออยู่เอง (ไม่นับว่าทับ)
+    ใช้ locking read เพื่อให้เห็นข้อมูลที่ commit ล่าสุดหลังได้ล็อก
+    (consistent read ของ REPEATABLE READ จะเห็นแค่ snapshot ตอนเริ่ม transaction)
+    """
+    conflict = session.exec(
+        select(Appointment.id).where(
+            Appointment.staff_id == staff_id,
+            Appointment.date == d,
+            Appointment.start_time < end,
+            Appointment.end_time > start,
+            Appointment.status != "canceled"
+        ).limit(1).with_for_update()
+    ).first()
+    if conflict is not None:
+        return True
+    stmt = select(SlotHold.id).where(
+        SlotHold.staff_id == staff_id,
+        SlotHold.date == d,
+        SlotHold.expires_at > datetime.utcnow(),
+        SlotHold.start_time < end,
+        SlotHold.end_time > start,
+    )
+    if ignore_hold:
+        stmt = stmt.where(SlotHold.token != ignore_hold)
+    return session.exec(stmt.limit(1).with_for_update()).first() is not None
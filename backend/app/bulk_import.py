@@ -0,0 +1,186 @@
+"""นำเข้าคิวทีละมาก (ย้ายข้อมูลจากสมุดจองหรือระบบเดิม)
+
+ตรวจทั้ง batch ในหน่วยความจำ: เวลาทำการ, วันหยุด, คิวซ้ำ/ทับซ้อนทั้งกับฐานข้อมูลและกันเองใน batch
+แล้ว insert เป็นก้อน (executemany) ใน transaction ของผู้เรียก แถวที่ผิดถูกข้ามและรายงานกลับพร้อมเหตุผล
+"""
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlmodel import Session, select
+from . import reference
+from .booking import lock_staff_days, staff_day_appointments
+from .models import APPOINTMENT_STATUSES, Appointment, Staff
+from .notifier import notifier
+
+INSERT_CHUNK_SIZE = 500
+NOTIFY_MODES = ("none", "summary", "each")
+REQUIRED_FIELDS = ("customer_name", "customer_phone", "date", "start_time", "service_id", "staff_id")
+
+def parse_rows(body: bytes, content_type: str) -> List[dict]:
+    """แปลง body เป็นรายการ dict: CSV (มี header) หรือ JSON (list หรือ {"appointments": [...]})"""
+    text = body.decode("utf-8-sig")
+    if "csv" in content_type:
+        return list(csv.DictReader(io.StringIO(text)))
+    try:
+        data = json.loads(text)
+    except ValueError:
+        raise ValueError("Body must be a JSON array or CSV with a header row")
+    if isinstance(data, dict):
+        data = data.get("appointments")
+    if not isinstance(data, list) or not all(isinstance(r, dict) for r in data):
+        raise ValueError("Body must be a JSON array of appointment objects")
+    return data
+
+def _text(raw: dict, field: str) -> str:
+    value = raw.get(field)
+    return "" if value is None else str(value).strip()
+
+def _parse_time(value: str, field: str) -> time:
+    try:
+        # รองรับทั้ง HH:MM และ HH:MM:SS (รูปแบบของ /appointments/export)
+        return time.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {field} format. Use HH:MM")
+
+def _parse_row(raw: dict) -> dict:
+    missing = [f for f in REQUIRED_FIELDS if not _text(raw, f)]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+    try:
+        d = datetime.strptime(_text(raw, "date"), "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+    try:
+        service_id = int(_text(raw, "service_id"))
+        staff_id = int(_text(raw, "staff_id"))
+    except ValueError:
+        raise ValueError("service_id and staff_id must be integers")
+    status = _text(raw, "status") or "pending"
+    if status not in APPOINTMENT_STATUSES:
+        raise ValueError(f"Invalid status '{status}'")
+    created_at = datetime.utcnow()
+    if _text(raw, "created_at"):
+        try:
+            created_at = datetime.fromisoformat(_text(raw, "created_at"))
+        except ValueError:
+            raise ValueError("Invalid created_at format")
+    return {
+        "customer_name": _text(raw, "customer_name"),
+        "customer_phone": _text(raw, "customer_phone"),
+        "date": d,
+        "start_time": _parse_time(_text(raw, "start_time"), "start_time"),
+        "end_time": _parse_time(_text(raw, "end_time"), "end_time") if _text(raw, "end_time") else None,
+        "service_id": service_id,
+        "staff_id": staff_id,
+        "status": status,
+        "note": _text(raw, "note") or None,
+        "created_at": created_at,
+    }
+
+def _check_calendar(session: Session, row: dict, holiday_dates) -> Optional[str]:
+    """เงื่อนไขเดียวกับ create_appointment (ไม่ต้องใช้ฐานข้อมูล นอกจาก cache ข้อมูลอ้างอิง)"""
+    bh = reference.business_hours_for(session, row["date"].weekday())
+    if not bh:
+        return "Shop closed on this day"
+    if not (bh.open_time <= row["start_time"] and row["end_time"] <= bh.close_time):
+        return "Outside business hours"
+    if row["date"] in holiday_dates:
+        return "Holiday"
+    return None
+
+def import_appointments(session: Session, raw_rows: List[dict], notify: str = "summary") -> dict:
+    """ตรวจและเพิ่มคิวใน transaction ของ session (ผู้เรียกเป็นคน commit/rollback)
+
+    คืน dict: inserted, errors [{"row": ลำดับแถวเริ่มที่ 1, "error": ...}], dates ที่มีคิวเพิ่ม, outbox_ids
+    """
+    errors: List[dict] = []
+    parsed: List[Tuple[int, dict]] = []
+    holiday_dates = reference.holiday_dates(session)
+
+    # 1) แปลงและตรวจแต่ละแถวโดยไม่แตะตารางคิว
+    for n, raw in enumerate(raw_rows, start=1):
+        try:
+            row = _parse_row(raw)
+        except ValueError as e:
+            errors.append({"row": n, "error": str(e)})
+            continue
+        service = reference.get_service(session, row["service_id"])
+        if not service:
+            errors.append({"row": n, "error": "Service not found"})
+            continue
+        if row["end_time"] is None:
+            end = datetime.combine(row["date"], row["start_time"]) + timedelta(minutes=service.duration_minutes)
+            if end.date() != row["date"]:
+                errors.append({"row": n, "error": "Appointment must end on the same day"})
+                continue
+            row["end_time"] = end.time()
+        if row["start_time"] >= row["end_time"]:
+            errors.append({"row": n, "error": "start_time must be before end_time"})
+            continue
+        error = _check_calendar(session, row, holiday_dates)
+        if error:
+            errors.append({"row": n, "error": error})
+            continue
+        parsed.append((n, row))
+
+    # 2) ล็อกพนักงาน/วันที่เกี่ยวข้องทั้งหมดตามลำดับ แล้วโหลดคิวเดิมครั้งเดียว
+    staff_ids = {row["staff_id"] for _, row in parsed}
+    known_staff = set(session.exec(select(Staff.id).where(Staff.id.in_(staff_ids))).all()) if staff_ids else set()
+    locked = lock_staff_days(session, [(row["staff_id"], row["date"]) for _, row in parsed if row["staff_id"] in known_staff])
+
+    taken = set()  # uq_appointment_slot ใช้กับทุกสถานะ (รวมที่ยกเลิก)
+    booked: Dict[Tuple[int, date], List[Tuple[time, time]]] = defaultdict(list)
+    for staff_id, d, start, end, service_id, status in staff_day_appointments(session, list(locked)):
+        taken.add((d, start, end, staff_id, service_id))
+        if status != "canceled":
+            booked[(staff_id, d)].append((start, end))
+
+    # 3) เช็คคิวซ้ำ/ทับซ้อนตามลำดับแถว แถวที่ผ่านแล้วนับเป็นคิวที่จองแล้วสำหรับแถวถัดไป
+    accepted: List[dict] = []
+    for n, row in parsed:
+        key = (row["staff_id"], row["date"])
+        if key not in locked:
+            errors.append({"row": n, "error": "Staff not found"})
+            continue
+        slot = (row["date"], row["start_time"], row["end_time"], row["staff_id"], row["service_id"])
+        if slot in taken:
+            errors.append({"row": n, "error": "Duplicate appointment"})
+            continue
+        if row["status"] != "canceled":
+            if any(s < row["end_time"] and row["start_time"] < e for s, e in booked[key]):
+                errors.append({"row": n, "error": "Time slot already booked"})
+                continue
+            booked[key].append((row["start_time"], row["end_time"]))
+        taken.add(slot)
+        accepted.append(row)
+
+    # 4) insert เป็นก้อน (executemany) ไม่ต้องสร้าง ORM object ทีละแถว
+    for i in range(0, len(accepted), INSERT_CHUNK_SIZE):
+        session.execute(insert(Appointment), accepted[i:i + INSERT_CHUNK_SIZE])
+
+    outbox_ids: List[int] = []
+    if accepted and notify == "each":
+        outbox_ids = notifier.enqueue_many(session, [
+            f"📅 คิวใหม่ (นำเข้า): {r['date']} {r['start_time']}-{r['end_time']}\n👤 {r['customer_name']} ({r['customer_phone']})\nหมายเหตุ: {r['note'] or '-'}"
+            for r in accepted
+        ])
+    elif accepted and notify == "summary":
+        dates = [r["date"] for r in accepted]
+        outbox_id = notifier.enqueue(
+            session,
+            f"📥 นำเข้าคิว {len(accepted)} รายการ ({min(dates)} ถึง {max(dates)})"
+            + (f"\n⚠️ ข้าม {len(errors)} รายการที่ไม่ผ่านการตรวจ" if errors else "")
+        )
+        outbox_ids = [outbox_id] if outbox_id is not None else []
+
+    errors.sort(key=lambda e: e["row"])
+    return {
+        "inserted": len(accepted),
+        "errors": errors,
+        "dates": sorted({r["date"] for r in accepted}),
+        "outbox_ids": outbox_ids,
+    }
@@ -0,0 +1,225 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+import orjson
+
+T = TypeVar("T")
+
+class TTLCache:
+    """cache ใน process แบบมีอายุ (TTL) สำหรับข้อมูลที่อ่านบ่อยแต่เปลี่ยนไม่บ่อย
+
+    key เป็น tuple ที่ตัวแรกเป็น namespace เช่น ("services",) เพื่อให้ invalidate ทั้งกลุ่มได้
+    ttl <= 0 คือปิด cache (โหลดใหม่ทุกครั้ง)
+    invalidate/clear เพิ่ม generation ค่าที่โหลดค้างอยู่ก่อนหน้านั้นจะไม่ถูกเก็บ (อาจเป็นข้อมูลก่อนแก้)
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: Dict[Tuple[Hashable, ...], Tuple[float, Any]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], T]) -> T:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+        value = loader()
+        if self.ttl > 0:
+            with self._lock:
+                if generation == self._generation:
+                    self._data[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, *namespaces: str):
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._data if k[0] in namespaces]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+            }
+
+class SlotCache:
+    """cache ผลลัพธ์ get_slots ตาม (date, service_id) พร้อมเลขเวอร์ชัน
+
+    เวอร์ชันของวันหนึ่ง = (เวอร์ชันรวม, เวอร์ชันของวันในสัปดาห์, เวอร์ชันของวันนั้น)
+    การจอง/ยืนยัน/ยกเลิกและวันหยุดเพิ่มเวอร์ชันของวัน, เวลาทำการ/ตารางพนักงานเพิ่มเวอร์ชันของวันในสัปดาห์
+    บริการ/พนักงานเพิ่มเวอร์ชันรวม ผลลัพธ์ที่คำนวณจากเวอร์ชันเก่าจะไม่ถูกเก็บ
+    ttl จำกัดอายุข้อมูลในกรณีที่ถูกเปลี่ยนจาก process อื่น
+    ETag เป็น hash ของผลลัพธ์ ทุก worker ได้ค่าเดียวกันเมื่อข้อมูลเหมือนกัน และเปลี่ยนเมื่อข้อมูลเปลี่ยน
+    ไม่ว่าจะเปลี่ยนจาก process ไหน
+    เก็บได้ไม่เกิน maxsize รายการ (LRU) และเวอร์ชันของวันที่ผ่านไปแล้วถูกทิ้งตอน bump_date
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._global_version = 0
+        self._weekday_versions: Dict[int, int] = {}
+        self._date_versions: Dict[date, int] = {}
+        self._data: "OrderedDict[Tuple[date, int], Tuple[Tuple[int, int, int], float, str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _version(self, d: date) -> Tuple[int, int, int]:
+        return (self._global_version, self._weekday_versions.get(d.weekday(), 0), self._date_versions.get(d, 0))
+
+    def version(self, d: date) -> Tuple[int, int, int]:
+        with self._lock:
+            return self._version(d)
+
+    def get(self, d: date, service_id: int) -> Optional[Tuple[str, Any]]:
+        """คืน (etag, payload) ถ้ายังใช้ได้"""
+        now = time.monotonic()
+        key = (d, service_id)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] == self._version(d) and entry[1] > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[2], entry[3]
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, d: date, service_id: int, version: Tuple[int, int, int], payload: Any) -> str:
+        """เก็บผลลัพธ์ที่คำนวณจาก version แล้วคืน ETag (ถ้าเวอร์ชันเปลี่ยนระหว่างคำนวณจะไม่เก็บ)"""
+        digest = hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=12)
+        etag = f'W/"{digest.hexdigest()}"'
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return etag
+        now = time.monotonic()
+        with self._lock:
+            if version == self._version(d):
+                for key in [k for k, entry in self._data.items() if entry[1] <= now]:
+                    del self._data[key]
+                self._data[(d, service_id)] = (version, now + self.ttl, etag, payload)
+                self._data.move_to_end((d, service_id))
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return etag
+
+    def bump_date(self, *dates: date):
+        today = date.today()
+        with self._lock:
+            for d in dates:
+                self._date_versions[d] = self._date_versions.get(d, 0) + 1
+                for key in [k for k in self._data if k[0] == d]:
+                    del self._data[key]
+            # วันที่ผ่านไปแล้วไม่มีใครขอ slots อีก (นอกช่วงจอง)
+            for d in [d for d in self._date_versions if d < today]:
+                del self._date_versions[d]
+
+    def bump_weekday(self, *weekdays: int):
+        with self._lock:
+            for wd in weekdays:
+                self._weekday_versions[wd] = self._weekday_versions.get(wd, 0) + 1
+            for key in [k for k in self._data if k[0].weekday() in weekdays]:
+                del self._data[key]
+
+    def bump_all(self):
+        with self._lock:
+            self._global_version += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "maxsize": self.maxsize,
+                "entries": len(self._data),
+                "tracked_dates": len(self._date_versions),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+            }
+
+class TokenCache:
+    """LRU cache ของ JWT ที่ตรวจลายเซ็นแล้ว -> claims ใช้ได้จนถึง exp ของ token
+
+    key คือ token ทั้งสตริง จึงได้ผลเฉพาะ token ที่เคยตรวจผ่านแล้วเท่านั้น
+    revoke_user() ทำให้ token ของผู้ใช้ที่ออก (iat) ก่อนวินาทีนั้นใช้ไม่ได้ (รวมที่ยังไม่อยู่ใน cache)
+    iat ของ JWT เป็นวินาทีเต็ม จึงเก็บเวลาตัดเป็นวินาทีเต็มเช่นกัน token ที่ออกในวินาทีเดียวกันหลัง revoke ยังใช้ได้
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, dict]" = OrderedDict()
+        self._revoked_before: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            claims = self._data.get(token)
+            if claims is not None:
+                if claims.get("exp", 0) > now and not self._revoked(claims):
+                    self._data.move_to_end(token)
+                    self.hits += 1
+                    return claims
+                del self._data[token]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, claims: dict):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[token] = claims
+            self._data.move_to_end(token)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def is_revoked(self, claims: dict) -> bool:
+        with self._lock:
+            return self._revoked(claims)
+
+    def _revoked(self, claims: dict) -> bool:
+        cutoff = self._revoked_before.get(str(claims.get("sub")))
+        return cutoff is not None and int(claims.get("iat", 0)) < cutoff
+
+    def revoke_user(self, user_id: Any):
+        sub = str(user_id)
+        with self._lock:
+            self._revoked_before[sub] = int(time.time())
+            for token in [t for t, c in self._data.items() if str(c.get("sub")) == sub]:
+                del self._data[token]
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "maxsize": self.maxsize,
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+            }
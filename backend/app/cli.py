@@ -0,0 +1,64 @@
+"""คำสั่งจัดการฐานข้อมูลแบบรันครั้งเดียว (แยกออกจากการเริ่มแอป)
+
+Usage:
+    python -m app.cli migrate          # อัปเดต schema ด้วย Alembic
+    python -m app.cli seed [--reset]   # เพิ่มข้อมูลเริ่มต้นที่ยังไม่มี (--reset ลบข้อมูลตั้งค่าเดิมก่อน)
+    python -m app.cli init             # migrate + seed (ใช้ก่อนเริ่มแอปครั้งแรก/หลังอัปเดตเวอร์ชัน)
+    python -m app.cli check            # ตรวจว่าฐานข้อมูลพร้อมใช้งาน
+"""
+import argparse
+import sys
+from sqlmodel import Session
+from .database import engine
+from .migrate import check_schema, run_migrations
+from . import seed as seeding
+
+def migrate():
+    run_migrations()
+    print("✅ อัปเดต schema สำเร็จ")
+
+def seed(reset: bool = False):
+    with Session(engine) as session:
+        if reset:
+            seeding.reset(session)
+            session.commit()
+            print("🗑️  ลบข้อมูลตั้งค่าเดิมแล้ว")
+        counts = seeding.run_seed(session)
+    for name, added in counts.items():
+        print(f"  - {name}: {'เพิ่ม ' + str(added) + ' รายการ' if added else 'มีอยู่แล้ว ข้าม'}")
+    print("✅ เพิ่มข้อมูลเริ่มต้นสำเร็จ")
+
+def init(reset: bool = False):
+    migrate()
+    seed(reset)
+
+def check():
+    check_schema()
+    print("✅ ฐานข้อมูลพร้อมใช้งาน")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Queue Booking database tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="upgrade schema to the latest revision")
+    for name in ("seed", "init"):
+        p = sub.add_parser(name, help="insert default data that is missing" if name == "seed" else "migrate + seed")
+        p.add_argument("--reset", action="store_true", help="delete services/staff/schedules/business hours first")
+    sub.add_parser("check", help="verify connectivity and schema revision")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "migrate":
+            migrate()
+        elif args.command == "seed":
+            seed(args.reset)
+        elif args.command == "init":
+            init(args.reset)
+        else:
+            check()
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""บีบอัด response ด้วย gzip โดยไม่แตะ Server-Sent Events
+
+GZipMiddleware ของ Starlette รุ่นที่ใช้อยู่บีบอัดทุก response รวมถึง text/event-stream ซึ่งทำให้ข่าวค้างอยู่ใน
+buffer ของ gzip จนกว่าจะครบก้อน (client ไม่ได้รับทันที) SSEAwareGZipMiddleware ปล่อย content type ที่ยกเว้นผ่านไปตรงๆ
+บน Starlette รุ่นใหม่ที่ยกเว้นให้เองแล้ว (DEFAULT_EXCLUDED_CONTENT_TYPES) จะใช้การทำงานของ class แม่
+"""
+from starlette.datastructures import Headers
+from starlette.middleware import gzip as starlette_gzip
+from starlette.types import Message, Receive, Scope, Send
+
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+class _Responder(starlette_gzip.GZipResponder):
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(EXCLUDED_CONTENT_TYPES):
+                # ใช้ทางเดียวกับ response ที่บีบอัดมาแล้ว: ส่งต่อทีละ chunk โดยไม่แก้อะไร
+                self.content_encoding_set = True
+
+_STARLETTE_EXCLUDES_SSE = hasattr(starlette_gzip, "DEFAULT_EXCLUDED_CONTENT_TYPES")
+
+class SSEAwareGZipMiddleware(starlette_gzip.GZipMiddleware):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if _STARLETTE_EXCLUDES_SSE:
+            await super().__call__(scope, receive, send)
+            return
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            responder = _Responder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
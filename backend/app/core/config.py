@@ -9,13 +9,74 @@ class Settings(BaseSettings):
     db_user: str = Field(default="root", alias="DB_USER")
     db_password: str = Field(default="password", alias="DB_PASSWORD")
     db_name: str = Field(default="queue_db", alias="DB_NAME")
+    # ระบุ URL เองได้ (เช่น sqlite:///test.db กับ sqlite+aiosqlite:///test.db ตอนทดสอบ)
+    database_url: str = Field(default="", alias="DATABASE_URL")
+    async_database_url: str = Field(default="", alias="ASYNC_DATABASE_URL")
+
+    # connection pool (ใช้ค่าเดียวกันทั้ง engine sync และ async)
+    db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=3600, alias="DB_POOL_RECYCLE")
+    # always = ping ทุกครั้งที่ยืม connection, idle = ping เฉพาะ connection ที่ว่างนานเกิน
+    # DB_POOL_PING_IDLE_SECONDS, never = ไม่ ping
+    db_pool_pre_ping: str = Field(default="always", alias="DB_POOL_PRE_PING")
+    db_pool_ping_idle_seconds: float = Field(default=30.0, alias="DB_POOL_PING_IDLE_SECONDS")
 
     app_secret: str = Field(default="CHANGE_ME", alias="APP_SECRET")
     admin_email: str = Field(default="admin@example.com", alias="ADMIN_EMAIL")
     admin_password: str = Field(default="admin123", alias="ADMIN_PASSWORD")
+    # จำนวน JWT ที่ตรวจแล้วเก็บไว้ใน cache (ต่อ process), 0 = ปิด
+    token_cache_size: int = Field(default=1024, alias="TOKEN_CACHE_SIZE")
+    # ค่า cost ของ bcrypt (รหัสผ่านเดิมที่ cost ต่างจากนี้จะถูก hash ใหม่ตอน login สำเร็จ)
+    bcrypt_rounds: int = Field(default=12, alias="BCRYPT_ROUNDS")
+    # process ที่ใช้ hash/ตรวจรหัสผ่าน (ต่อ worker), 0 = ใช้ threadpool ของแอป
+    password_hash_workers: int = Field(default=1, alias="PASSWORD_HASH_WORKERS")
+    # จำนวนการตรวจรหัสผ่านที่รอคิวได้พร้อมกัน เกินนี้ตอบ 429 ทันที
+    password_hash_max_pending: int = Field(default=8, alias="PASSWORD_HASH_MAX_PENDING")
+    # จำกัดการ login: ต่อ IP (ทุกครั้ง) และต่อบัญชี (เฉพาะที่ผิด) ภายใน window วินาที
+    login_ip_limit: int = Field(default=20, alias="LOGIN_IP_LIMIT")
+    login_ip_window: float = Field(default=60.0, alias="LOGIN_IP_WINDOW")
+    login_account_limit: int = Field(default=5, alias="LOGIN_ACCOUNT_LIMIT")
+    login_account_window: float = Field(default=900.0, alias="LOGIN_ACCOUNT_WINDOW")
 
     allowed_origins: List[str] = Field(default=["*"], alias="ALLOWED_ORIGINS")
     line_notify_token: str = Field(default="", alias="LINE_NOTIFY_TOKEN")
+    # ส่ง LINE Notify ผ่าน background worker (app/notifier.py)
+    line_notify_url: str = Field(default="https://notify-api.line.me/api/notify", alias="LINE_NOTIFY_URL")
+    line_notify_timeout: float = Field(default=5.0, alias="LINE_NOTIFY_TIMEOUT")
+    line_notify_connect_timeout: float = Field(default=5.0, alias="LINE_NOTIFY_CONNECT_TIMEOUT")
+    line_notify_pool_size: int = Field(default=2, alias="LINE_NOTIFY_POOL_SIZE")
+    line_notify_max_attempts: int = Field(default=5, alias="LINE_NOTIFY_MAX_ATTEMPTS")
+    line_notify_retry_seconds: float = Field(default=5.0, alias="LINE_NOTIFY_RETRY_SECONDS")
+    line_notify_queue_size: int = Field(default=1000, alias="LINE_NOTIFY_QUEUE_SIZE")
+    line_notify_poll_seconds: float = Field(default=10.0, alias="LINE_NOTIFY_POLL_SECONDS")
+
+    # อายุ cache ข้อมูลอ้างอิง (บริการ/พนักงาน/เวลาทำการ/วันหยุด) หน่วยวินาที, 0 = ปิด
+    reference_cache_ttl: float = Field(default=300.0, alias="REFERENCE_CACHE_TTL")
+    # อายุ cache ผลลัพธ์ slots (ถูกล้างทันทีเมื่อมีการจองใน process เดียวกัน) หน่วยวินาที, 0 = ปิด
+    slot_cache_ttl: float = Field(default=60.0, alias="SLOT_CACHE_TTL")
+    # จำนวนผลลัพธ์ (วัน, บริการ) สูงสุดใน cache slots ต่อ process เกินแล้วทิ้งตัวที่ไม่ได้ใช้นานที่สุด
+    slot_cache_size: int = Field(default=512, alias="SLOT_CACHE_SIZE")
+
+    # push การเปลี่ยนแปลงผ่าน SSE: ว่าง = กระจายใน process, redis://host:6379/0 = ผ่าน Redis (หลาย worker)
+    pubsub_url: str = Field(default="", alias="PUBSUB_URL")
+    sse_heartbeat_seconds: float = Field(default=15.0, alias="SSE_HEARTBEAT_SECONDS")
+    sse_queue_size: int = Field(default=100, alias="SSE_QUEUE_SIZE")
+    # อายุ (วินาที) ของ ticket ใช้ครั้งเดียวสำหรับเปิด stream ของแอดมิน (EventSource ส่ง header ไม่ได้)
+    stream_ticket_seconds: float = Field(default=30.0, alias="STREAM_TICKET_SECONDS")
+
+    # การกันช่วงเวลาระหว่างลูกค้ากรอกข้อมูล: อายุ (นาที) และจำนวนครั้งที่กันได้ต่อ IP ต่อช่วงเวลา (วินาที)
+    slot_hold_minutes: float = Field(default=5.0, alias="SLOT_HOLD_MINUTES")
+    slot_hold_ip_limit: int = Field(default=10, alias="SLOT_HOLD_IP_LIMIT")
+    slot_hold_ip_window: float = Field(default=300.0, alias="SLOT_HOLD_IP_WINDOW")
+
+    # การเลือกพนักงานให้อัตโนมัติของ POST /appointments/any: least_loaded | round_robin | fewest_gaps
+    staff_assign_strategy: str = Field(default="least_loaded", alias="STAFF_ASSIGN_STRATEGY")
+
+    # บีบอัด response ที่ใหญ่กว่า GZIP_MINIMUM_SIZE ไบต์ (0 = ปิด), level 1-9 (สูง = เล็กลงแต่ใช้ CPU มากขึ้น)
+    gzip_minimum_size: int = Field(default=1000, alias="GZIP_MINIMUM_SIZE")
+    gzip_level: int = Field(default=6, alias="GZIP_LEVEL")
 
     @field_validator("allowed_origins", mode="before")
     @classmethod
@@ -1,19 +1,133 @@
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from .core.config import settings
+from .metrics import Histogram
 
 # Ensure UTF8MB4 for Thai characters
-DATABASE_URL = (
+DATABASE_URL = settings.database_url or (
     f"mysql+pymysql://{settings.db_user}:{settings.db_password}"
     f"@{settings.db_host}:{settings.db_port}/{settings.db_name}?charset=utf8mb4"
 )
+ASYNC_DATABASE_URL = settings.async_database_url or (
+    f"mysql+aiomysql://{settings.db_user}:{settings.db_password}"
+    f"@{settings.db_host}:{settings.db_port}/{settings.db_name}?charset=utf8mb4"
+)
+
+# หน่วยวินาที
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+def _instrumented(pool_cls):
+    """subclass ของ pool ที่จับเวลาการยืม connection (รวมเวลารอคิวและเวลาเปิด connection ใหม่)"""
+    class InstrumentedPool(pool_cls):
+        checkout_wait = Histogram(CHECKOUT_WAIT_BUCKETS)
+        timeouts = 0
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                type(self).timeouts += 1
+                raise
+            finally:
+                self.checkout_wait.observe(time.perf_counter() - start)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_cls.__name__}"
+    return InstrumentedPool
+
+def _pool_options(poolclass) -> dict:
+    return dict(
+        poolclass=_instrumented(poolclass),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping == "always",
+    )
+
+def _install_idle_ping(target: Engine):
+    """ping เฉพาะ connection ที่คืน pool มานานเกินกำหนด ประหยัด round-trip ตอนโหลดสูง"""
+    @event.listens_for(target, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(target, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.db_pool_ping_idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception:
+            # ให้ pool ทิ้ง connection นี้แล้วเปิดใหม่
+            raise exc.DisconnectionError()
 
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
     echo=False,
+    **_pool_options(QueuePool),
 )
 
+# ใช้กับ endpoint ที่เป็น async def (รอ I/O ฐานข้อมูลโดยไม่กิน thread ของ threadpool)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    **_pool_options(AsyncAdaptedQueuePool),
+)
+
+def _install_sqlite_transactions(target: Engine):
+    """SQLite (ใช้ทดสอบ/พัฒนา): driver เปิด transaction เองเฉพาะก่อน INSERT/UPDATE ทำให้ SAVEPOINT แรก
+    commit ทั้ง transaction ตอน release และ SQLite ไม่มี SELECT ... FOR UPDATE
+    จึงเปิด transaction เองด้วย BEGIN IMMEDIATE (ได้ write lock ทั้งไฟล์ตั้งแต่ต้น)
+    การจองพร้อมกันเข้าคิวกันเหมือนล็อกแถวของ MySQL
+    ทุก transaction (รวมการอ่าน) จึงต่อคิวกัน และ SQLite ไม่ได้ให้คิวตามลำดับ ตอนโหลดสูงบางตัวรอนานกว่า
+    ค่าเริ่มต้น 5 วินาทีของ driver จึงให้รอได้เท่า DB_POOL_TIMEOUT (เหมือนรอ connection จาก pool)
+    """
+    @event.listens_for(target, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.db_pool_timeout * 1000)}")
+        cursor.close()
+
+    @event.listens_for(target, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+if engine.dialect.name == "sqlite":
+    _install_sqlite_transactions(engine)
+if async_engine.dialect.name == "sqlite":
+    _install_sqlite_transactions(async_engine.sync_engine)
+
+if settings.db_pool_pre_ping == "idle":
+    _install_idle_ping(engine)
+    _install_idle_ping(async_engine.sync_engine)
+
+def pool_stats(target: Engine) -> dict:
+    pool = target.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # pool.overflow() ติดลบเมื่อยังเปิด connection ไม่ครบ pool_size
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.db_max_overflow,
+        "timeout_seconds": settings.db_pool_timeout,
+        "timeouts": getattr(type(pool), "timeouts", 0),
+        "checkout_wait_seconds": pool.checkout_wait.snapshot() if hasattr(pool, "checkout_wait") else None,
+    }
+
 def get_session():
     with Session(engine) as session:
         yield session
+
+async def get_async_session():
+    async with AsyncSession(async_engine) as session:
+        yield session
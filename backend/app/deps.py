@@ -1,22 +1,50 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session
-from .database import get_session
-from .security import decode_access_token
+from .database import engine, get_session
+from .security import verify_access_token, verify_stream_ticket
 from .models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> User:
-    payload = decode_access_token(token)
-    if not payload or not payload.get("sub"):
+def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    payload = verify_access_token(token)
+    if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = session.get(User, int(payload["sub"]))
+    return payload
+
+def get_current_user(claims: dict = Depends(get_token_claims), session: Session = Depends(get_session)) -> User:
+    user = session.get(User, int(claims["sub"]))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
 
-def require_admin(user: User = Depends(get_current_user)) -> User:
-    if user.role != "admin":
+def _check_admin(claims: dict, session: Session) -> dict:
+    role = claims.get("role")
+    if role is None:
+        user = session.get(User, int(claims["sub"]))
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        role = user.role
+    if role != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
-    return user
+    return claims
+
+def require_admin(claims: dict = Depends(get_token_claims), session: Session = Depends(get_session)) -> dict:
+    """ตรวจสิทธิ์จาก role ใน token (ไม่ query ฐานข้อมูล) token รุ่นเก่าที่ไม่มี role ค่อยอ่านจากตาราง User
+
+    role ใน token เชื่อได้เพราะทุกทางที่แก้ role/รหัสผ่านหรือลบผู้ใช้ต้องเรียก invalidate_user_tokens()
+    token ที่ออกก่อนนั้นถูกปฏิเสธ (401) ตั้งแต่ get_token_claims
+    """
+    return _check_admin(claims, session)
+
+def require_admin_ticket(ticket: str = Query(..., description="ticket จาก POST /appointments/stream/ticket")) -> dict:
+    """require_admin สำหรับ EventSource ซึ่งส่ง header Authorization ไม่ได้ (ticket ใช้ได้ครั้งเดียว)
+
+    เปิด session เองแล้วปิดทันที เพราะ dependency ของ stream อยู่จนกว่า client จะตัดการเชื่อมต่อ
+    """
+    claims = verify_stream_ticket(ticket)
+    if not claims:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or used ticket")
+    with Session(engine) as session:
+        return _check_admin(claims, session)
@@ -0,0 +1,82 @@
+"""เขียนรายการตั้งค่า (เวลาทำการ, วันหยุด, ตารางพนักงาน) แบบเทียบกับแถวเดิม
+
+แทนการลบทั้งหมดแล้วเพิ่มใหม่: แถวที่ไม่เปลี่ยนไม่ถูกแตะ id เดิมคงอยู่ และผู้เรียกรู้ว่า key ไหนเปลี่ยน
+จึงล้าง cache เฉพาะวันที่เกี่ยวข้องได้
+"""
+from datetime import date, time
+from typing import Any, Callable, Dict, Hashable, List, Sequence
+from sqlmodel import Session, SQLModel
+
+def as_time(value: Any) -> time:
+    """body ของ endpoint เป็น table model ที่ไม่ถูก validate เวลาจึงอาจยังเป็น string"""
+    if isinstance(value, time):
+        return value
+    try:
+        return time.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}'. Use HH:MM")
+
+def as_date(value: Any) -> date:
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD")
+
+def sync_rows(
+    session: Session,
+    existing: List[SQLModel],
+    incoming: List[SQLModel],
+    key: Callable[[SQLModel], Hashable],
+    fields: Sequence[str],
+) -> Dict[str, list]:
+    """ทำให้ existing ตรงกับ incoming โดย insert/update/delete เฉพาะแถวที่ต่าง (ผู้เรียกเป็นคน commit)
+
+    แถวเทียบกันด้วย key() ถ้าฐานข้อมูลมีหลายแถวที่ key ซ้ำ (ข้อมูลเก่า) จะเก็บแถวที่ id น้อยที่สุด
+    คืน {"inserted": [...], "updated": [...], "deleted": [...]} เป็นรายการ key
+    """
+    inserted, updated, deleted = [], [], []
+    current: Dict[Hashable, SQLModel] = {}
+    for row in sorted(existing, key=lambda r: r.id):
+        k = key(row)
+        if k in current:
+            session.delete(row)
+            updated.append(k)
+        else:
+            current[k] = row
+
+    seen = set()
+    for row in incoming:
+        k = key(row)
+        if k in seen:
+            raise ValueError(f"Duplicate entry for {k}")
+        seen.add(k)
+        old = current.get(k)
+        if old is None:
+            row.id = None
+            session.add(row)
+            inserted.append(k)
+            continue
+        changed = False
+        for field in fields:
+            value = getattr(row, field)
+            if getattr(old, field) != value:
+                setattr(old, field, value)
+                changed = True
+        if changed:
+            session.add(old)
+            if k not in updated:
+                updated.append(k)
+
+    for k, row in current.items():
+        if k not in seen:
+            session.delete(row)
+            deleted.append(k)
+            if k in updated:
+                updated.remove(k)
+    session.flush()
+    return {"inserted": sorted(inserted), "updated": sorted(updated), "deleted": sorted(deleted)}
+
+def changed_keys(changes: Dict[str, list]) -> set:
+    return set(changes["inserted"]) | set(changes["updated"]) | set(changes["deleted"])
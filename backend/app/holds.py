@@ -0,0 +1,128 @@
+"""การกันช่วงเวลาชั่วคราว (slot hold) และตัวลบการกันที่หมดอายุ
+
+ทุก query ที่อ่านการกันกรองด้วย expires_at > now อยู่แล้ว การกันที่หมดอายุจึงไม่มีผลแม้ยังไม่ถูกลบ
+HoldReaper เก็บเวลาหมดอายุไว้ใน heap แล้วตื่นตอนถึงเวลาของตัวแรกพอดี (ไม่กวาดตารางเป็นระยะ)
+เพื่อลบแถว ล้าง cache slots ของวันนั้น และแจ้ง client ว่าช่วงเวลากลับมาว่าง
+"""
+import heapq
+import logging
+import threading
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from . import database
+from .models import SlotHold
+from .pubsub import get_broker
+from .slots import slot_cache
+
+logger = logging.getLogger(__name__)
+
+def active_holds(session: Session, d: date, staff_ids: List[int], for_update: bool = False) -> List[SlotHold]:
+    """การกันที่ยังไม่หมดอายุ (for_update: locking read หลังล็อกพนักงาน/วันแล้ว เหมือน has_conflict)"""
+    if not staff_ids:
+        return []
+    stmt = select(SlotHold).where(
+        SlotHold.date == d,
+        SlotHold.staff_id.in_(staff_ids),
+        SlotHold.expires_at > datetime.utcnow(),
+    )
+    if for_update:
+        stmt = stmt.with_for_update()
+    return session.exec(stmt).all()
+
+def hold_event(hold: SlotHold) -> dict:
+    """ข้อมูลการกันที่ส่งให้ client (เก็บก่อน commit เหมือน appointment_event)"""
+    return {
+        "date": hold.date.isoformat(),
+        "start": hold.start_time.strftime("%H:%M"),
+        "end": hold.end_time.strftime("%H:%M"),
+        "staff_id": hold.staff_id,
+    }
+
+def publish_hold(kind: str, event: dict):
+    """kind: held | released (เรียกหลัง commit แล้วเท่านั้น)"""
+    get_broker().publish(f"slots:{event['date']}", {"type": kind, **event})
+
+class HoldReaper:
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int]] = []
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        self.reaped = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with Session(database.engine) as session:
+            # การกันที่หมดอายุระหว่างที่เซิร์ฟเวอร์ปิดอยู่
+            session.exec(delete(SlotHold).where(SlotHold.expires_at <= datetime.utcnow()))
+            session.commit()
+            pending = session.exec(select(SlotHold.expires_at, SlotHold.id)).all()
+        with self._cond:
+            self._stop = False
+            self._heap = [tuple(row) for row in pending]
+            heapq.heapify(self._heap)
+        self._thread = threading.Thread(target=self._run, name="hold-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def schedule(self, hold_id: int, expires_at: datetime):
+        with self._cond:
+            heapq.heappush(self._heap, (expires_at, hold_id))
+            # ปลุกเฉพาะเมื่อการกันนี้หมดอายุก่อนตัวที่รออยู่
+            if self._heap[0][1] == hold_id:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stop:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    wait = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._stop:
+                    return
+                now = datetime.utcnow()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[1])
+            try:
+                self.reap(due)
+            except Exception:
+                logger.exception("Failed to reap slot holds")
+
+    def reap(self, hold_ids: List[int]) -> int:
+        """ลบการกันที่หมดอายุแล้ว (ตัวที่ถูกใช้จองหรือยกเลิกไปก่อนจะไม่เจอในตาราง)"""
+        with Session(database.engine) as session:
+            expired = session.exec(
+                select(SlotHold).where(SlotHold.id.in_(hold_ids), SlotHold.expires_at <= datetime.utcnow())
+            ).all()
+            if not expired:
+                return 0
+            events = [hold_event(h) for h in expired]
+            session.exec(delete(SlotHold).where(SlotHold.id.in_([h.id for h in expired])))
+            session.commit()
+        slot_cache.bump_date(*{date.fromisoformat(e["date"]) for e in events})
+        for event in events:
+            publish_hold("released", event)
+        self.reaped += len(events)
+        return len(events)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"scheduled": len(self._heap), "reaped": self.reaped}
+
+hold_reaper = HoldReaper()
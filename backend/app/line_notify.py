@@ -1,19 +1,148 @@
 import http.client
+import threading
+import time
 import urllib.parse
+from typing import List, Optional, Tuple
+from .core.config import settings
 
-def send_line_notify(token: str, message: str):
-    if not token:
-        return False
-    conn = http.client.HTTPSConnection("notify-api.line.me")
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Authorization": f"Bearer {token}",
-    }
-    payload = urllib.parse.urlencode({"message": message})
-    conn.request("POST", "/api/notify", payload, headers)
-    res = conn.getresponse()
-    try:
-        return 200 <= res.status < 300
-    finally:
-        res.read()
+# ข้อผิดพลาดที่เกิดได้เมื่อเซิร์ฟเวอร์ปิด keep-alive connection ที่เราเก็บไว้ไปแล้ว
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+class LineNotifyClient:
+    """HTTP client สำหรับ LINE Notify ที่เก็บ keep-alive connection ไว้ใช้ซ้ำ
+
+    ลด TCP + TLS handshake เมื่อส่งหลายข้อความติดกัน connection ที่ค้างนานเกิน
+    max_idle หรือถูกฝั่งเซิร์ฟเวอร์ปิดไปแล้วจะถูกเปิดใหม่อัตโนมัติ
+    """
+
+    def __init__(
+        self,
+        url: str = "https://notify-api.line.me/api/notify",
+        pool_size: int = 2,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 5.0,
+        max_idle: float = 60.0,
+    ):
+        parts = urllib.parse.urlsplit(url)
+        # รองรับ http:// เพื่อชี้ไปยัง stub server ตอนทดสอบ
+        self._conn_cls = http.client.HTTPConnection if parts.scheme == "http" else http.client.HTTPSConnection
+        self._host = parts.netloc
+        self._path = parts.path or "/"
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_idle = max_idle
+        self._idle: List[Tuple[http.client.HTTPConnection, float]] = []
+        self._lock = threading.Lock()
+        self.handshakes = 0
+        self.reused = 0
+        self.reconnects = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "handshakes": self.handshakes,
+                "reused": self.reused,
+                "reconnects": self.reconnects,
+                "idle_connections": len(self._idle),
+            }
+
+    def _connect(self) -> http.client.HTTPConnection:
+        conn = self._conn_cls(self._host, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        with self._lock:
+            self.handshakes += 1
+        return conn
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                conn, released_at = self._idle.pop()
+                if now - released_at <= self.max_idle:
+                    self.reused += 1
+                    return conn, True
+                conn.close()
+        return self._connect(), False
+
+    def _release(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append((conn, time.monotonic()))
+                return
         conn.close()
+
+    def _post(self, conn: http.client.HTTPConnection, body: str, headers: dict) -> http.client.HTTPResponse:
+        conn.request("POST", self._path, body, headers)
+        res = conn.getresponse()
+        res.read()
+        return res
+
+    def send(self, token: str, message: str) -> bool:
+        if not token:
+            return False
+        headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Authorization": f"Bearer {token}",
+        }
+        body = urllib.parse.urlencode({"message": message})
+        conn, reused = self._acquire()
+        try:
+            try:
+                res = self._post(conn, body, headers)
+            except _STALE_ERRORS:
+                if not reused:
+                    raise
+                # connection ที่เก็บไว้ถูกปิดไปแล้ว เปิดใหม่แล้วลองอีกครั้งเดียว
+                conn.close()
+                with self._lock:
+                    self.reconnects += 1
+                conn = self._connect()
+                res = self._post(conn, body, headers)
+        except Exception:
+            conn.close()
+            raise
+        if res.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        return 200 <= res.status < 300
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+_client: Optional[LineNotifyClient] = None
+_client_lock = threading.Lock()
+
+def get_line_client() -> LineNotifyClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LineNotifyClient(
+                url=settings.line_notify_url,
+                pool_size=settings.line_notify_pool_size,
+                connect_timeout=settings.line_notify_connect_timeout,
+                read_timeout=settings.line_notify_timeout,
+            )
+        return _client
+
+def close_line_client():
+    """ปิด connection ที่เก็บไว้ (ถ้ายังไม่เคยสร้าง client ก็ไม่ต้องทำอะไร)"""
+    with _client_lock:
+        client = _client
+    if client is not None:
+        client.close()
+
+def send_line_notify(token: str, message: str):
+    return get_line_client().send(token, message)
@@ -0,0 +1,36 @@
+import bisect
+import threading
+from typing import Sequence
+
+class Histogram:
+    """histogram แบบ bucket คงที่ (ค่าสะสมแบบ Prometheus) ใช้ได้จากหลาย thread"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            if value > self._max:
+                self._max = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative = {}
+            running = 0
+            for bound, n in zip(self.buckets, self._counts):
+                running += n
+                cumulative[f"le_{bound:g}"] = running
+            count = running + self._counts[-1]
+            cumulative["le_inf"] = count
+            return {
+                "count": count,
+                "sum": round(self._sum, 6),
+                "max": round(self._max, 6),
+                "buckets": cumulative,
+            }
@@ -0,0 +1,64 @@
+"""รัน Alembic migrations จากโค้ด (แทน SQLModel.metadata.create_all)
+
+alembic ถูก import ตอนเรียกใช้จริงเท่านั้น (CLI) ส่วน check_schema() ที่รันตอนเริ่มแอป
+อ่าน revision จากไฟล์ migration ตรงๆ เพื่อไม่ให้การเริ่มแอปช้าลง
+"""
+import os
+import re
+from typing import Optional
+from sqlalchemy import inspect, text
+from .database import engine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+# revision ที่ตรงกับ schema ที่ create_all เคยสร้างไว้
+BASELINE_REVISION = "0001"
+
+_REVISION_RE = re.compile(r'^(down_revision|revision)\s*(?::[^=]+)?=\s*["\']?([\w-]+|None)["\']?', re.M)
+
+def alembic_config():
+    from alembic.config import Config
+    cfg = Config()
+    cfg.set_main_option("script_location", MIGRATIONS_DIR)
+    return cfg
+
+def run_migrations(revision: str = "head"):
+    from alembic import command
+    cfg = alembic_config()
+    with engine.begin() as connection:
+        cfg.attributes["connection"] = connection
+        insp = inspect(connection)
+        # ฐานข้อมูลที่สร้างด้วย create_all มาก่อน: มีตารางแล้วแต่ยังไม่มีประวัติ migration
+        if not insp.has_table("alembic_version") and insp.has_table("appointment"):
+            command.stamp(cfg, BASELINE_REVISION)
+        command.upgrade(cfg, revision)
+
+def head_revision() -> str:
+    """revision ล่าสุด = revision ที่ไม่มีไฟล์ไหนอ้างเป็น down_revision"""
+    revisions, parents = set(), set()
+    versions_dir = os.path.join(MIGRATIONS_DIR, "versions")
+    for name in os.listdir(versions_dir):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(versions_dir, name), encoding="utf-8") as f:
+            found = dict((k, v) for k, v in _REVISION_RE.findall(f.read()))
+        if "revision" in found:
+            revisions.add(found["revision"])
+            parents.add(found.get("down_revision"))
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected a single migration head, found {sorted(heads)}")
+    return heads.pop()
+
+def check_schema():
+    """ตรวจว่าเชื่อมต่อฐานข้อมูลได้และ schema อยู่ที่ revision ล่าสุด (ไม่แก้ไขอะไร)"""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        current: Optional[str] = None
+        if inspect(connection).has_table("alembic_version"):
+            current = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    head = head_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Database schema is at {current or 'an empty database'}, expected {head}; "
+            "run `python -m app.cli init` first"
+        )
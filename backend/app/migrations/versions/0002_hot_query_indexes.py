@@ -0,0 +1,71 @@
+"""index สำหรับ query หลักของ router, ตารางล็อกการจอง และ outbox ของ LINE Notify
+
+ตาราง/index บางตัวอาจถูกสร้างไปแล้วด้วย create_all ในเวอร์ชันก่อนหน้า จึงเช็คก่อนสร้าง
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    # (ชื่อ, ตาราง, คอลัมน์)  — query ที่ใช้อยู่ในวงเล็บ
+    ("ix_appointment_staff_date_start", "appointment", ["staff_id", "date", "start_time"]),  # get_slots, เช็คคิวทับซ้อน
+    ("ix_appointment_date_start", "appointment", ["date", "start_time"]),  # list/export ของแอดมิน
+    ("ix_appointment_status_date", "appointment", ["status", "date"]),  # list กรองตามสถานะ
+    ("ix_staffservice_service_active", "staffservice", ["service_id", "is_active"]),  # พนักงานที่ทำบริการได้
+    ("ix_staffschedule_staff_weekday", "staffschedule", ["staff_id", "weekday"]),  # ตารางพนักงานรายวัน
+    ("ix_businesshours_weekday", "businesshours", ["weekday"]),
+    ("ix_holiday_date", "holiday", ["date"]),
+    ("ix_user_email", "user", ["email"]),  # login
+]
+
+def _existing_indexes(table: str) -> set:
+    return {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+def _has_table(table: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(table)
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+    if not _has_table("staffdaylock"):
+        op.create_table(
+            "staffdaylock",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("staff_id", sa.Integer(), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.ForeignKeyConstraint(["staff_id"], ["staff.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("staff_id", "date", name="uq_staff_day_lock"),
+        )
+
+    if not _has_table("notificationoutbox"):
+        op.create_table(
+            "notificationoutbox",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("message", sa.Text(), nullable=False),
+            sa.Column("status", sa.String(length=255), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+            sa.Column("last_error", sa.String(length=255), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("sent_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    if "ix_notificationoutbox_status_next" not in _existing_indexes("notificationoutbox"):
+        op.create_index("ix_notificationoutbox_status_next", "notificationoutbox", ["status", "next_attempt_at"])
+
+def downgrade():
+    op.drop_table("notificationoutbox")
+    op.drop_table("staffdaylock")
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,40 @@
+"""ตาราง slothold สำหรับกันช่วงเวลาชั่วคราวก่อนจอง
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "slothold",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("token", sqlmodel.AutoString(), nullable=False),
+        sa.Column("staff_id", sa.Integer(), nullable=False),
+        sa.Column("service_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["service_id"], ["service.id"]),
+        sa.ForeignKeyConstraint(["staff_id"], ["staff.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_slothold_token", "slothold", ["token"], unique=True)
+    op.create_index("ix_slothold_staff_date_expires", "slothold", ["staff_id", "date", "expires_at"])
+    op.create_index("ix_slothold_expires", "slothold", ["expires_at"])
+
+def downgrade():
+    op.drop_index("ix_slothold_expires", table_name="slothold")
+    op.drop_index("ix_slothold_staff_date_expires", table_name="slothold")
+    op.drop_index("ix_slothold_token", table_name="slothold")
+    op.drop_table("slothold")
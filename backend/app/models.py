@@ -1,13 +1,13 @@
 from typing import Optional
 from datetime import date, time, datetime
 from sqlmodel import SQLModel, Field
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, Text, UniqueConstraint
 
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
     phone: str
-    email: Optional[str] = None
+    email: Optional[str] = Field(default=None, index=True)  # ใช้ตอน login
     role: str = "customer"  # 'customer' or 'admin'
     password_hash: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -31,6 +31,9 @@ class Staff(SQLModel, table=True):
 
 class StaffService(SQLModel, table=True):
     """ความสัมพันธ์ระหว่างพนักงานและบริการที่ทำได้"""
+    __table_args__ = (
+        Index("ix_staffservice_service_active", "service_id", "is_active"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     staff_id: int = Field(foreign_key="staff.id")
     service_id: int = Field(foreign_key="service.id")
@@ -39,13 +42,16 @@ class StaffService(SQLModel, table=True):
 
 class BusinessHours(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    weekday: int  # 0=Mon ... 6=Sun
+    weekday: int = Field(index=True)  # 0=Mon ... 6=Sun
     open_time: time
     close_time: time
     slot_minutes: int = 30
 
 class StaffSchedule(SQLModel, table=True):
     """ตารางเวลาของพนักงานแต่ละคน"""
+    __table_args__ = (
+        Index("ix_staffschedule_staff_weekday", "staff_id", "weekday"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     staff_id: int = Field(foreign_key="staff.id")
     weekday: int  # 0=Mon ... 6=Sun
@@ -54,10 +60,17 @@ class StaffSchedule(SQLModel, table=True):
     is_working: bool = True
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+APPOINTMENT_STATUSES = ("pending", "confirmed", "completed", "canceled")
+
 class Appointment(SQLModel, table=True):
     __table_args__ = (
         # เปลี่ยน constraint ให้รองรับ resource-based
         UniqueConstraint("date", "start_time", "end_time", "staff_id", "service_id", name="uq_appointment_slot"),
+        # ใช้กับการเช็คคิวทับซ้อนของพนักงานในวันเดียวกัน
+        Index("ix_appointment_staff_date_start", "staff_id", "date", "start_time"),
+        # รายการ/ส่งออกของแอดมิน: ช่วงวันที่ เรียงตาม (date, start_time, id)
+        Index("ix_appointment_date_start", "date", "start_time"),
+        Index("ix_appointment_status_date", "status", "date"),
     )
     id: Optional[int] = Field(default=None, primary_key=True)
     customer_name: str
@@ -67,11 +80,71 @@ class Appointment(SQLModel, table=True):
     end_time: time
     service_id: int = Field(foreign_key="service.id")  # บริการที่จอง
     staff_id: int = Field(foreign_key="staff.id")      # พนักงานที่ให้บริการ
-    status: str = "pending"  # pending | confirmed | completed | canceled
+    status: str = "pending"  # ค่าใดค่าหนึ่งใน APPOINTMENT_STATUSES
     note: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class StaffDayLock(SQLModel, table=True):
+    """แถวล็อกต่อพนักงานต่อวัน ใช้ SELECT ... FOR UPDATE กันการจองทับซ้อนเมื่อมีคำขอพร้อมกัน"""
+    __table_args__ = (
+        UniqueConstraint("staff_id", "date", name="uq_staff_day_lock"),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    staff_id: int = Field(foreign_key="staff.id")
+    date: date
+
+class SlotHold(SQLModel, table=True):
+    """การกันช่วงเวลาไว้ชั่วคราวระหว่างที่ลูกค้ากรอกข้อมูลจอง (หมดอายุเองที่ expires_at)"""
+    __table_args__ = (
+        Index("ix_slothold_staff_date_expires", "staff_id", "date", "expires_at"),
+        Index("ix_slothold_expires", "expires_at"),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    token: str = Field(unique=True, index=True)  # ลูกค้าใช้อ้างอิงตอนจองหรือยกเลิกการกัน
+    staff_id: int = Field(foreign_key="staff.id")
+    service_id: int = Field(foreign_key="service.id")
+    date: date
+    start_time: time
+    end_time: time
+    expires_at: datetime
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class SlotHoldRequest(SQLModel):
+    """body ของ POST /appointments/holds (end_time ว่างได้ = คำนวณจากระยะเวลาของบริการ)"""
+    date: date
+    start_time: time
+    end_time: Optional[time] = None
+    staff_id: int
+    service_id: int
+
+class AnyStaffAppointmentRequest(SQLModel):
+    """body ของ POST /appointments/any: เหมือน Appointment แต่ไม่ระบุพนักงาน (ระบบเลือกให้)"""
+    customer_name: str
+    customer_phone: str
+    date: date
+    start_time: time
+    end_time: Optional[time] = None
+    service_id: int
+    note: Optional[str] = None
+
 class Holiday(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_holiday_date", "date"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     date: date
     reason: Optional[str] = None
+
+class NotificationOutbox(SQLModel, table=True):
+    """ข้อความ LINE Notify ที่รอส่ง (ส่งโดย background worker ใน app/notifier.py)"""
+    __table_args__ = (
+        Index("ix_notificationoutbox_status_next", "status", "next_attempt_at"),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    message: str = Field(sa_type=Text)
+    status: str = "pending"  # pending | sending | sent | failed
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
@@ -0,0 +1,152 @@
+"""ส่ง LINE Notify นอก request path
+
+ข้อความถูกบันทึกลงตาราง NotificationOutbox ใน transaction เดียวกับข้อมูลที่เปลี่ยน
+แล้ว background thread เป็นคนส่ง (มี timeout, retry แบบ backoff) ข้อความที่ค้างอยู่
+ตอนปิดเซิร์ฟเวอร์จะถูกส่งต่อหลังเริ่มใหม่ เพราะ worker กวาดตาราง outbox เป็นระยะ
+"""
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import update
+from sqlmodel import Session, select
+from .core.config import settings
+from . import database
+from .models import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+# ระยะเวลาที่ worker จองข้อความไว้ส่ง ถ้า process ตายระหว่างส่ง worker อื่นจะหยิบไปส่งต่อหลังหมดเวลานี้
+CLAIM_LEASE = timedelta(seconds=60)
+MAX_BACKOFF = timedelta(minutes=10)
+SWEEP_BATCH = 50
+
+class LineNotifier:
+    def __init__(self):
+        self._queue: "queue.Queue[int]" = queue.Queue(maxsize=settings.line_notify_queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="line-notifier", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        # LINE client (http.client/ssl) ถูก import ตอนส่งครั้งแรกเท่านั้น
+        from .line_notify import close_line_client
+        close_line_client()
+
+    def enqueue(self, session: Session, message: str) -> Optional[int]:
+        """เพิ่มข้อความลง outbox ใน session ของผู้เรียก (ผู้เรียกเป็นคน commit)"""
+        if not settings.line_notify_token:
+            return None
+        row = NotificationOutbox(message=message)
+        session.add(row)
+        session.flush()
+        return row.id
+
+    def enqueue_many(self, session: Session, messages: List[str]) -> List[int]:
+        """enqueue หลายข้อความด้วย flush ครั้งเดียว"""
+        if not settings.line_notify_token or not messages:
+            return []
+        rows = [NotificationOutbox(message=m) for m in messages]
+        session.add_all(rows)
+        session.flush()
+        return [row.id for row in rows]
+
+    def submit(self, outbox_id: Optional[int]):
+        """ปลุก worker ให้ส่งข้อความทันที (เรียกหลัง commit แล้วเท่านั้น)"""
+        if outbox_id is None:
+            return
+        try:
+            self._queue.put_nowait(outbox_id)
+        except queue.Full:
+            # คิวเต็ม: ข้อความยังอยู่ใน outbox รอรอบกวาดถัดไป
+            pass
+
+    def _run(self):
+        last_sweep = datetime.min
+        while not self._stop.is_set():
+            try:
+                outbox_id = self._queue.get(timeout=settings.line_notify_poll_seconds)
+            except queue.Empty:
+                outbox_id = None
+            try:
+                if outbox_id is not None:
+                    self.deliver(outbox_id)
+                if datetime.utcnow() - last_sweep >= timedelta(seconds=settings.line_notify_poll_seconds):
+                    last_sweep = datetime.utcnow()
+                    self.sweep()
+            except Exception:
+                logger.exception("LINE notifier loop failed")
+
+    def sweep(self) -> int:
+        """ส่งข้อความที่ถึงเวลาส่ง (รวมที่ค้างจากการ restart และที่รอ retry)"""
+        with Session(database.engine) as session:
+            due = session.exec(
+                select(NotificationOutbox.id).where(
+                    NotificationOutbox.status.in_(["pending", "sending"]),
+                    NotificationOutbox.next_attempt_at <= datetime.utcnow()
+                ).order_by(NotificationOutbox.next_attempt_at).limit(SWEEP_BATCH)
+            ).all()
+        for outbox_id in due:
+            if self._stop.is_set():
+                break
+            self.deliver(outbox_id)
+        return len(due)
+
+    def deliver(self, outbox_id: int) -> bool:
+        with Session(database.engine) as session:
+            now = datetime.utcnow()
+            # จองข้อความก่อนส่ง กันไม่ให้หลาย worker ส่งซ้ำ
+            claimed = session.exec(
+                update(NotificationOutbox)
+                .where(
+                    NotificationOutbox.id == outbox_id,
+                    NotificationOutbox.status.in_(["pending", "sending"]),
+                    NotificationOutbox.next_attempt_at <= now
+                )
+                .values(status="sending", next_attempt_at=now + CLAIM_LEASE)
+            ).rowcount
+            session.commit()
+            if not claimed:
+                return False
+
+            from .line_notify import send_line_notify
+            row = session.get(NotificationOutbox, outbox_id)
+            error = None
+            try:
+                ok = send_line_notify(settings.line_notify_token, row.message)
+                if not ok:
+                    error = "LINE Notify returned non-2xx status"
+            except Exception as e:
+                ok = False
+                error = repr(e)[:255]
+
+            row.attempts += 1
+            if ok:
+                row.status = "sent"
+                row.sent_at = datetime.utcnow()
+                row.last_error = None
+            elif row.attempts >= settings.line_notify_max_attempts:
+                row.status = "failed"
+                row.last_error = error
+                logger.warning("LINE notify #%s failed permanently: %s", outbox_id, error)
+            else:
+                backoff = timedelta(seconds=settings.line_notify_retry_seconds * 2 ** (row.attempts - 1))
+                row.status = "pending"
+                row.next_attempt_at = datetime.utcnow() + min(backoff, MAX_BACKOFF)
+                row.last_error = error
+            session.add(row)
+            session.commit()
+            return ok
+
+notifier = LineNotifier()
@@ -0,0 +1,206 @@
+"""pub/sub สำหรับ push การเปลี่ยนแปลงของคิวไปยัง client ผ่าน Server-Sent Events
+
+ค่าเริ่มต้นกระจายข่าวภายใน process (worker เดียว) ถ้าตั้ง PUBSUB_URL=redis://... จะ publish ผ่าน Redis
+(หรือเซิร์ฟเวอร์ที่ใช้ protocol เดียวกัน) ทุก worker รับข่าวเดียวกันได้ ต้องติดตั้ง `pip install redis` เพิ่ม
+
+channel ที่ใช้: "admin" (ทุกการเปลี่ยนแปลง) และ "slots:YYYY-MM-DD" (การเปลี่ยนแปลงที่กระทบ slots ของวันนั้น)
+"""
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+from .core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """คิวข่าวของ client หนึ่งราย (ต้องสร้างใน event loop ที่จะอ่าน)
+
+    client ที่อ่านไม่ทันจนคิวเต็มจะถูกทำเครื่องหมาย overflowed ให้ส่ง resync แทนข่าวที่หายไป
+    """
+
+    def __init__(self, channels: Set[str], maxsize: int):
+        self.channels = channels
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Tuple[str, dict]]" = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def _put(self, channel: str, event: dict):
+        try:
+            self.queue.put_nowait((channel, event))
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> Optional[Tuple[str, dict]]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def reset(self):
+        self.overflowed = False
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+class InProcessBroker:
+    """กระจายข่าวให้ subscription ใน process นี้ publish() เรียกจาก thread ไหนก็ได้"""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subs: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, *channels: str) -> Subscription:
+        sub = Subscription(set(channels), self.queue_size)
+        with self._lock:
+            for channel in channels:
+                self._subs.setdefault(channel, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            for channel in sub.channels:
+                subs = self._subs.get(channel)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subs[channel]
+
+    def publish(self, channel: str, event: dict):
+        self.published += 1
+        self.deliver(channel, event)
+
+    def deliver(self, channel: str, event: dict):
+        with self._lock:
+            subs = list(self._subs.get(channel, ()))
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._put, channel, event)
+            except RuntimeError:
+                # event loop ของ client ปิดไปแล้ว
+                self.unsubscribe(sub)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "channels": len(self._subs),
+                "subscriptions": len({s for subs in self._subs.values() for s in subs}),
+                "published": self.published,
+            }
+
+class RedisBroker(InProcessBroker):
+    """publish ผ่าน Redis แล้ว thread ของแต่ละ worker รับกลับมากระจายให้ subscription ใน process
+
+    publish() ถูกเรียกจาก async handler จึงแค่ใส่คิว ให้ thread "pubsub-publisher" เป็นคนส่งไป Redis
+    (client ของ redis เป็นแบบ blocking ถ้าส่งตรงๆ Redis ช้า/หลุดจะหยุด event loop ทั้ง worker)
+    """
+
+    PREFIX = "queue-booking:"
+    # ข่าวที่รอส่งได้สูงสุด เกินนี้ทิ้ง (client ได้ข้อมูลจริงจากฐานข้อมูลตอน resync/โหลดใหม่)
+    PUBLISH_QUEUE_SIZE = 1000
+
+    def __init__(self, url: str, queue_size: int = 100):
+        super().__init__(queue_size)
+        import redis  # optional dependency โหลดเมื่อใช้จริงเท่านั้น
+        self._redis = redis.Redis.from_url(url)
+        self._listener: Optional[threading.Thread] = None
+        self._outgoing: "queue.Queue[Tuple[str, dict]]" = queue.Queue(self.PUBLISH_QUEUE_SIZE)
+        self._publisher: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def _start(self, attr: str, target, name: str):
+        if getattr(self, attr) is None:
+            with self._lock:
+                if getattr(self, attr) is None:
+                    thread = threading.Thread(target=target, name=name, daemon=True)
+                    thread.start()
+                    setattr(self, attr, thread)
+
+    def subscribe(self, *channels: str) -> Subscription:
+        self._start("_listener", self._listen, "pubsub-listener")
+        return super().subscribe(*channels)
+
+    def publish(self, channel: str, event: dict):
+        self.published += 1
+        self._start("_publisher", self._send, "pubsub-publisher")
+        try:
+            self._outgoing.put_nowait((channel, event))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("Publish queue full, dropped %s", channel)
+
+    def _send(self):
+        while True:
+            channel, event = self._outgoing.get()
+            try:
+                self._redis.publish(self.PREFIX + channel, json.dumps(event, default=str))
+            except Exception:
+                # push เป็นแค่ตัวช่วย ข้อมูลจริงอยู่ในฐานข้อมูลแล้ว
+                logger.exception("Failed to publish %s", channel)
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(self.PREFIX + "*")
+                for message in pubsub.listen():
+                    channel = message["channel"].decode()[len(self.PREFIX):]
+                    self.deliver(channel, json.loads(message["data"]))
+            except Exception:
+                logger.exception("Pub/sub listener disconnected, retrying")
+                time.sleep(1.0)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "backend": "redis", "pending": self._outgoing.qsize(), "dropped": self.dropped}
+
+_broker: Optional[InProcessBroker] = None
+_broker_lock = threading.Lock()
+
+def get_broker() -> InProcessBroker:
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            if settings.pubsub_url:
+                _broker = RedisBroker(settings.pubsub_url, settings.sse_queue_size)
+            else:
+                _broker = InProcessBroker(settings.sse_queue_size)
+        return _broker
+
+def appointment_event(ap) -> dict:
+    """ข้อมูลคิวที่ส่งให้ client (เก็บก่อน commit เพราะ commit ทำให้ attribute ของ ORM หมดอายุ)"""
+    return {
+        "id": ap.id,
+        "date": ap.date.isoformat(),
+        "start": ap.start_time.strftime("%H:%M"),
+        "end": ap.end_time.strftime("%H:%M"),
+        "staff_id": ap.staff_id,
+        "service_id": ap.service_id,
+        "status": ap.status,
+        "customer_name": ap.customer_name,
+    }
+
+def publish_appointment(kind: str, event: dict):
+    """kind: created | confirmed | canceled (เรียกหลัง commit แล้วเท่านั้น)"""
+    broker = get_broker()
+    broker.publish("admin", {"type": kind, "appointment": event})
+    # ฝั่งลูกค้าได้เฉพาะช่วงเวลาที่ว่าง/ไม่ว่าง ไม่มีข้อมูลส่วนตัวของผู้จอง
+    if kind in ("created", "canceled"):
+        broker.publish(f"slots:{event['date']}", {
+            "type": "booked" if kind == "created" else "released",
+            "date": event["date"],
+            "start": event["start"],
+            "end": event["end"],
+            "staff_id": event["staff_id"],
+        })
+
+def publish_dates_changed(kind: str, dates, **info):
+    """การเปลี่ยนแปลงหลายคิวพร้อมกัน (เช่น นำเข้า) client ควรโหลด slots ของวันนั้นใหม่"""
+    broker = get_broker()
+    broker.publish("admin", {"type": kind, "dates": [d.isoformat() for d in dates], **info})
+    for d in dates:
+        broker.publish(f"slots:{d.isoformat()}", {"type": "changed", "date": d.isoformat()})
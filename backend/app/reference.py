@@ -0,0 +1,92 @@
+"""ข้อมูลอ้างอิง (บริการ, พนักงาน, เวลาทำการ, วันหยุด) ผ่าน TTL cache
+
+ข้อมูลเหล่านี้เปลี่ยนแค่ไม่กี่ครั้งต่อเดือน endpoint ที่แก้ไขต้องเรียก invalidate()
+หลัง commit object ที่คืนไปถูก expunge ออกจาก session แล้ว ห้ามแก้ไขและห้าม session.add กลับ
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set
+from sqlmodel import Session, select
+from .cache import TTLCache
+from .core.config import settings
+from .slots import slot_cache
+from .models import BusinessHours, Holiday, Service, Staff, StaffSchedule, StaffService
+
+cache = TTLCache(settings.reference_cache_ttl)
+
+def _detach(session: Session, rows: list) -> list:
+    for row in rows:
+        session.expunge(row)
+    return rows
+
+def invalidate(*namespaces: str, weekdays: Iterable[int] = (), dates: Iterable[date] = ()):
+    """ล้าง cache ข้อมูลอ้างอิง และ cache ผลลัพธ์ slots ที่คำนวณจากข้อมูลเดิม
+
+    ถ้าระบุ weekdays/dates จะล้างเฉพาะ slots ของวันเหล่านั้น ไม่ระบุ = ล้างทั้งหมด
+    """
+    cache.invalidate(*namespaces)
+    weekdays, dates = set(weekdays), set(dates)
+    if not weekdays and not dates:
+        slot_cache.bump_all()
+        return
+    if weekdays:
+        slot_cache.bump_weekday(*weekdays)
+    if dates:
+        slot_cache.bump_date(*dates)
+
+def _services_by_id(session: Session) -> Dict[int, Service]:
+    def load():
+        rows = _detach(session, session.exec(select(Service).order_by(Service.id)).all())
+        return {s.id: s for s in rows}
+    return cache.get_or_load(("services",), load)
+
+def get_service(session: Session, service_id: int) -> Optional[Service]:
+    return _services_by_id(session).get(service_id)
+
+def active_services(session: Session) -> List[Service]:
+    return [s for s in _services_by_id(session).values() if s.is_active]
+
+def active_staff(session: Session) -> List[Staff]:
+    return cache.get_or_load(
+        ("staff",),
+        lambda: _detach(session, session.exec(select(Staff).where(Staff.is_active == True).order_by(Staff.id)).all()),
+    )
+
+def staff_ids_for_service(session: Session, service_id: int) -> List[int]:
+    def load():
+        by_service: Dict[int, List[int]] = defaultdict(list)
+        for ss in session.exec(select(StaffService).where(StaffService.is_active == True).order_by(StaffService.id)).all():
+            by_service[ss.service_id].append(ss.staff_id)
+        return dict(by_service)
+    return cache.get_or_load(("staff_services",), load).get(service_id, [])
+
+def working_schedules(session: Session, weekday: int, staff_ids: Optional[List[int]] = None) -> List[StaffSchedule]:
+    def load():
+        by_weekday: Dict[int, List[StaffSchedule]] = defaultdict(list)
+        rows = session.exec(select(StaffSchedule).where(StaffSchedule.is_working == True).order_by(StaffSchedule.id)).all()
+        for sc in _detach(session, rows):
+            by_weekday[sc.weekday].append(sc)
+        return dict(by_weekday)
+    schedules = cache.get_or_load(("staff_schedules",), load).get(weekday, [])
+    if staff_ids is None:
+        return schedules
+    wanted = set(staff_ids)
+    return [sc for sc in schedules if sc.staff_id in wanted]
+
+def business_hours(session: Session) -> List[BusinessHours]:
+    return cache.get_or_load(
+        ("business_hours",),
+        lambda: _detach(session, session.exec(select(BusinessHours).order_by(BusinessHours.id)).all()),
+    )
+
+def business_hours_for(session: Session, weekday: int) -> Optional[BusinessHours]:
+    return next((bh for bh in business_hours(session) if bh.weekday == weekday), None)
+
+def holidays(session: Session) -> List[Holiday]:
+    return cache.get_or_load(
+        ("holidays", "rows"),
+        lambda: _detach(session, session.exec(select(Holiday).order_by(Holiday.id)).all()),
+    )
+
+def holiday_dates(session: Session) -> Set[date]:
+    return cache.get_or_load(("holidays", "dates"), lambda: {h.date for h in holidays(session)})
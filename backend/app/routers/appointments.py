@@ -1,194 +1,617 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import and_, delete, or_
 from sqlmodel import Session, select
-from ..database import get_session
-from ..models import Appointment, BusinessHours, Holiday, Service, StaffService, StaffSchedule
-from ..deps import require_admin
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import async_engine, get_session, get_async_session
+from ..models import AnyStaffAppointmentRequest, Appointment, SlotHold, SlotHoldRequest
+from ..schemas import AppointmentRead, columns
+from .. import reference, bulk_import
+from ..assign import STRATEGIES, build_staff_days, choose_staff
+from ..holds import active_holds, hold_event, hold_reaper, publish_hold
+from ..throttle import SlidingWindowLimiter
+from ..deps import require_admin, require_admin_ticket
+from ..notifier import notifier
+from ..security import create_stream_ticket
 from ..core.config import settings
-from ..line_notify import send_line_notify
+from ..pubsub import appointment_event, get_broker, publish_appointment, publish_dates_changed
+from ..slots import COMPACT_MEDIA_TYPE, any_staff_view, build_day_slots, compact_slots, slot_cache
+from ..booking import lock_staff_day, lock_staff_days, has_conflict, staff_day_appointments
 from datetime import datetime, timedelta, date, time
-from typing import List
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import base64
+import csv
+import io
+import json
+import logging
+import uuid
 
 router = APIRouter(prefix="/appointments", tags=["appointments"])
+logger = logging.getLogger(__name__)
 
-def _overlap(a_start: time, a_end: time, b_start: time, b_end: time) -> bool:
-    return max(a_start, b_start) < min(a_end, b_end)
+# จำกัดช่วงวันที่ของ /availability เพื่อไม่ให้คำนวณนานเกินไป
+MAX_AVAILABILITY_DAYS = 62
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 500
+MAX_IMPORT_ROWS = 5000
 
-@router.get("")
-def list_appointments(
-    session: Session = Depends(get_session),
-    date_from: date | None = None,
-    date_to: date | None = None,
-    status: str | None = None,
-    _: None = Depends(require_admin),
-):
-    stmt = select(Appointment)
+hold_limiter = SlidingWindowLimiter(settings.slot_hold_ip_limit, settings.slot_hold_ip_window)
+
+def _encode_cursor(ap_date: date, start_time: time, ap_id: int) -> str:
+    raw = f"{ap_date.isoformat()}|{start_time.isoformat()}|{ap_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[date, time, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        d, t, ap_id = raw.split("|")
+        return date.fromisoformat(d), time.fromisoformat(t), int(ap_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _filtered_appointments(stmt, date_from: date | None, date_to: date | None, status: str | None):
     if date_from:
         stmt = stmt.where(Appointment.date >= date_from)
     if date_to:
         stmt = stmt.where(Appointment.date <= date_to)
     if status:
         stmt = stmt.where(Appointment.status == status)
-    return session.exec(stmt.order_by(Appointment.date, Appointment.start_time)).all()
+    return stmt.order_by(Appointment.date, Appointment.start_time, Appointment.id)
+
+APPOINTMENT_COLUMNS = columns(Appointment, AppointmentRead)
+
+@router.get("", response_model=List[AppointmentRead])
+async def list_appointments(
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = None,
+    cursor: str | None = Query(None, description="ค่าจาก header X-Next-Cursor ของหน้าก่อน"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    _: None = Depends(require_admin),
+):
+    # keyset pagination บน (date, start_time, id) — หน้าถัดไปไม่ต้อง OFFSET ข้ามแถวเดิม
+    # select เฉพาะคอลัมน์: ไม่ต้องสร้าง ORM object และไม่เข้า identity map
+    stmt = _filtered_appointments(select(*APPOINTMENT_COLUMNS), date_from, date_to, status)
+    if cursor:
+        c_date, c_start, c_id = _decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            Appointment.date > c_date,
+            and_(Appointment.date == c_date, Appointment.start_time > c_start),
+            and_(Appointment.date == c_date, Appointment.start_time == c_start, Appointment.id > c_id),
+        ))
+    result = await session.execute(stmt.limit(limit + 1))
+    rows = result.mappings().all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last["date"], last["start_time"], last["id"])
+    return rows
+
+EXPORT_COLUMNS = [c.name for c in Appointment.__table__.columns]
+
+async def _stream_export(stmt, fmt: str):
+    # เปิด session เองเพราะ session จาก dependency ถูกปิดก่อนเริ่มส่ง body
+    async with AsyncSession(async_engine) as session:
+        result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(EXPORT_COLUMNS)
+            async for batch in result.mappings().partitions():
+                for row in batch:
+                    writer.writerow(["" if row[c] is None else str(row[c]) for c in EXPORT_COLUMNS])
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+            yield buf.getvalue()
+        else:
+            async for batch in result.mappings().partitions():
+                yield "".join(json.dumps(dict(row), default=str, ensure_ascii=False) + "\n" for row in batch)
+
+@router.get("/export")
+async def export_appointments(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = None,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    _: None = Depends(require_admin),
+):
+    """ส่งออกคิวทั้งหมดแบบ streaming (NDJSON หรือ CSV) ใช้หน่วยความจำคงที่ไม่ว่าข้อมูลจะมากแค่ไหน"""
+    stmt = _filtered_appointments(select(Appointment.__table__), date_from, date_to, status)
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_export(stmt, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="appointments.{format}"'},
+    )
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    # เทียบแบบ weak comparison ตาม RFC 9110
+    return "*" in tags or etag.removeprefix("W/") in [t.removeprefix("W/") for t in tags]
+
+async def _sse(request: Request, sub, accept=None):
+    """ส่งข่าวจาก subscription เป็น Server-Sent Events จนกว่า client จะตัดการเชื่อมต่อ"""
+    broker = get_broker()
+    try:
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            item = await sub.get(settings.sse_heartbeat_seconds)
+            if sub.overflowed:
+                # อ่านไม่ทันจนข่าวหาย: ให้ client โหลดข้อมูลใหม่ทั้งหมด
+                sub.reset()
+                yield "event: resync\ndata: {}\n\n"
+                continue
+            if item is None:
+                yield ": ping\n\n"
+                continue
+            _, event = item
+            if accept is None or accept(event):
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+    finally:
+        broker.unsubscribe(sub)
+
+def _sse_response(stream) -> StreamingResponse:
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        # X-Accel-Buffering: ไม่ให้ nginx พักข้อมูลไว้ก่อนส่ง
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/slots/stream")
+async def stream_slots(
+    request: Request,
+    d: date = Query(..., description="YYYY-MM-DD"),
+    service_id: int = Query(..., description="Service ID"),
+):
+    """push เมื่อ slots ของ (d, service_id) เปลี่ยน: booked / released (มี staff_id, start, end) หรือ changed / resync
+
+    client ควรเปิด stream ก่อนแล้วค่อย GET /appointments/slots เพื่อไม่ให้พลาดการเปลี่ยนแปลงระหว่างนั้น
+    """
+    # ใช้ session สั้นๆ ของตัวเอง: stream เปิดค้างนาน ห้ามถือ connection ของ pool ไว้
+    async with AsyncSession(async_engine) as session:
+        service = await session.run_sync(reference.get_service, service_id)
+        if not service or not service.is_active:
+            raise HTTPException(status_code=400, detail="Service not found")
+        staff_ids = set(await session.run_sync(reference.staff_ids_for_service, service_id))
+    sub = get_broker().subscribe(f"slots:{d.isoformat()}")
+
+    def accept(event: dict) -> bool:
+        # ข่าวของพนักงานที่ทำบริการนี้ไม่ได้ไม่กระทบ slots ของบริการนี้
+        return "staff_id" not in event or event["staff_id"] in staff_ids
+
+    return _sse_response(_sse(request, sub, accept))
+
+@router.post("/stream/ticket")
+def create_admin_stream_ticket(claims: dict = Depends(require_admin)):
+    """ticket ใช้ครั้งเดียวสำหรับ GET /appointments/stream?ticket= (ขอใหม่ทุกครั้งที่เชื่อมต่อ)"""
+    return {"ticket": create_stream_ticket(claims), "expires_in": settings.stream_ticket_seconds}
+
+@router.get("/stream")
+async def stream_admin(request: Request, _: dict = Depends(require_admin_ticket)):
+    """push ทุกการเปลี่ยนแปลงของคิวให้หน้าแอดมิน (EventSource ส่ง header ไม่ได้ จึงใช้ ticket ใน ?ticket=)"""
+    sub = get_broker().subscribe("admin")
+    return _sse_response(_sse(request, sub))
 
 @router.get("/slots")
-def get_slots(
+async def get_slots(
+    request: Request,
     d: date = Query(..., description="YYYY-MM-DD"), 
     service_id: int = Query(..., description="Service ID"),
-    session: Session = Depends(get_session)
+    view: str = Query("staff", pattern="^(staff|any)$", description="staff = แถวต่อพนักงาน, any = รวมเป็นแถวเดียวต่อช่วงเวลา"),
+    format: str | None = Query(None, pattern="^(full|compact)$", description=f"compact = เฉพาะช่วงที่ว่างแบบ run-length (หรือส่ง Accept: {COMPACT_MEDIA_TYPE})"),
+    session: AsyncSession = Depends(get_async_session)
 ):
     try:
-        # ตรวจสอบบริการ
-        service = session.get(Service, service_id)
-        if not service or not service.is_active:
-            raise HTTPException(status_code=400, detail="Service not found")
-        
-        # หาพนักงานที่ทำบริการนี้ได้
-        staff_services = session.exec(
-            select(StaffService).where(
-                StaffService.service_id == service_id,
-                StaffService.is_active == True
-            )
-        ).all()
-        
-        if not staff_services:
-            return {"date": d.isoformat(), "slots": [], "message": "No staff available for this service"}
-        
-        staff_ids = [ss.staff_id for ss in staff_services]
-        
-        # หาตารางเวลาของพนักงาน
-        weekday = d.weekday()  # 0=Monday, 6=Sunday
-        staff_schedules = session.exec(
-            select(StaffSchedule).where(
-                StaffSchedule.staff_id.in_(staff_ids),
-                StaffSchedule.weekday == weekday,
-                StaffSchedule.is_working == True
-            )
-        ).all()
-
-        # ดึงข้อมูล business hours เพื่อใช้กำหนดความยาวของสเต็ป
-        bh = session.exec(select(BusinessHours).where(BusinessHours.weekday == weekday)).first()
-        if not bh:
-            return {"date": d.isoformat(), "slots": [], "message": f"No business hours for weekday {weekday}"}
-
-        if not staff_schedules:
-            return {"date": d.isoformat(), "slots": [], "message": f"No staff schedule for weekday {weekday}"}
-
-        # สร้าง slots จากตารางเวลาของพนักงาน
-        slots = []
-        step = timedelta(minutes=bh.slot_minutes)
-        service_duration = timedelta(minutes=service.duration_minutes)
-        for schedule in staff_schedules:
-            start = datetime.combine(d, schedule.open_time)
-            end = datetime.combine(d, schedule.close_time)
-
-            # หาคิวที่มีอยู่แล้วของพนักงานคนนี้
-            existing = session.exec(
-                select(Appointment).where(
-                    Appointment.date == d,
-                    Appointment.staff_id == schedule.staff_id,
-                    Appointment.status != "canceled"
-                )
-            ).all()
-
-            t = start
-            while t + service_duration <= end:
-                slot_start = t.time()
-                slot_end = (t + service_duration).time()
-
-                # ตรวจสอบว่าช่วงเวลานี้ว่างหรือไม่
-                conflict = any(
-                    _overlap(slot_start, slot_end, ap.start_time, ap.end_time)
-                    for ap in existing
-                )
-
-                slots.append({
-                    "start": slot_start.strftime("%H:%M"),
-                    "end": slot_end.strftime("%H:%M"),
-                    "available": not conflict,
-                    "staff_id": schedule.staff_id,
-                    "service_id": service_id,
-                    "duration_minutes": service.duration_minutes
-                })
-
-                t += step
-        
-        return {
-            "date": d.isoformat(), 
-            "slots": slots, 
-            "service": service.name,
-            "duration_minutes": service.duration_minutes,
-            "debug": {
-                "weekday": weekday,
-                "staff_count": len(staff_ids),
-                "schedule_count": len(staff_schedules),
-                "slots_count": len(slots)
-            }
-        }
-        
+        cached = slot_cache.get(d, service_id)
+        if cached:
+            etag, payload = cached
+        else:
+            version = slot_cache.version(d)
+            # ใช้โค้ด sync ร่วมกับ endpoint อื่นผ่าน run_sync (I/O ยังเป็น async)
+            payload = await session.run_sync(_compute_slots, d, service_id)
+            etag = slot_cache.put(d, service_id, version, payload)
+    except HTTPException:
+        raise
     except Exception as e:
-        import traceback
-        print(f"Error in get_slots: {e}")
-        print(traceback.format_exc())
+        logger.exception("get_slots failed for d=%s service_id=%s", d, service_id)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+    if format is None:
+        format = "compact" if COMPACT_MEDIA_TYPE in request.headers.get("accept", "") else "full"
+    # คำนวณจากผลลัพธ์ที่ cache ไว้ ETag ต่างกันตามรูปแบบแต่เปลี่ยนตามกัน
+    if format == "compact":
+        etag = etag[:-1] + f'-{view}-compact"'
+        payload = compact_slots(payload, view)
+    elif view == "any":
+        etag = etag[:-1] + '-any"'
+        payload = {**payload, "slots": any_staff_view(payload["slots"])}
+
+    # ให้ frontend ตรวจกลับด้วย If-None-Match แล้วได้ 304 ถ้าไม่มีอะไรเปลี่ยน
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    # payload เป็น dict ของค่าพื้นฐานอยู่แล้ว ส่งให้ orjson ตรงๆ ไม่ต้องผ่าน jsonable_encoder
+    return ORJSONResponse(payload, headers=headers)
+
+def _compute_slots(session: Session, d: date, service_id: int) -> dict:
+    # ตรวจสอบบริการ
+    service = reference.get_service(session, service_id)
+    if not service or not service.is_active:
+        raise HTTPException(status_code=400, detail="Service not found")
+    
+    # หาพนักงานที่ทำบริการนี้ได้
+    staff_ids = reference.staff_ids_for_service(session, service_id)
+    
+    if not staff_ids:
+        return {"date": d.isoformat(), "slots": [], "message": "No staff available for this service"}
+    
+    # หาตารางเวลาของพนักงาน
+    weekday = d.weekday()  # 0=Monday, 6=Sunday
+    staff_schedules = reference.working_schedules(session, weekday, staff_ids)
+
+    # ดึงข้อมูล business hours เพื่อใช้กำหนดความยาวของสเต็ป
+    bh = reference.business_hours_for(session, weekday)
+    if not bh:
+        return {"date": d.isoformat(), "slots": [], "message": f"No business hours for weekday {weekday}"}
+
+    if not staff_schedules:
+        return {"date": d.isoformat(), "slots": [], "message": f"No staff schedule for weekday {weekday}"}
+
+    # ดึงคิวของพนักงานทุกคนในวันนั้นด้วย query เดียว แล้วแยกตามพนักงาน
+    scheduled_ids = [sc.staff_id for sc in staff_schedules]
+    existing_by_staff: Dict[int, List[Appointment]] = defaultdict(list)
+    for ap in session.exec(
+        select(Appointment).where(
+            Appointment.date == d,
+            Appointment.staff_id.in_(scheduled_ids),
+            Appointment.status != "canceled"
+        )
+    ).all():
+        existing_by_staff[ap.staff_id].append(ap)
+    # ช่วงที่ลูกค้าคนอื่นกันไว้ถือว่าไม่ว่างเหมือนคิวที่จองแล้ว
+    for hold in active_holds(session, d, scheduled_ids):
+        existing_by_staff[hold.staff_id].append(hold)
+
+    # สร้าง slots จากตารางเวลาของพนักงาน
+    slots = build_day_slots(d, service, staff_schedules, bh, existing_by_staff)
+    
+    return {
+        "date": d.isoformat(), 
+        "slots": slots, 
+        "service": service.name,
+        "service_id": service.id,
+        "duration_minutes": service.duration_minutes,
+        "step_minutes": bh.slot_minutes,
+        "debug": {
+            "weekday": weekday,
+            "staff_count": len(staff_ids),
+            "schedule_count": len(staff_schedules),
+            "slots_count": len(slots)
+        }
+    }
+
+@router.get("/availability")
+def get_availability(
+    date_from: date = Query(..., alias="from", description="YYYY-MM-DD"),
+    date_to: date = Query(..., alias="to", description="YYYY-MM-DD"),
+    service_id: int = Query(..., description="Service ID"),
+    session: Session = Depends(get_session)
+):
+    """slots หลายวันในครั้งเดียว: โหลดข้อมูลอ้างอิงครั้งเดียว และดึงคิวทั้งช่วงด้วย query เดียว"""
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    num_days = (date_to - date_from).days + 1
+    if num_days > MAX_AVAILABILITY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range too large (max {MAX_AVAILABILITY_DAYS} days)")
+
+    service = reference.get_service(session, service_id)
+    if not service or not service.is_active:
+        raise HTTPException(status_code=400, detail="Service not found")
+
+    staff_ids = reference.staff_ids_for_service(session, service_id)
+    days = [date_from + timedelta(days=i) for i in range(num_days)]
+    if not staff_ids:
+        return {
+            "from": date_from.isoformat(),
+            "to": date_to.isoformat(),
+            "service_id": service_id,
+            "days": [{"date": d.isoformat(), "slots": []} for d in days],
+            "message": "No staff available for this service",
+        }
+
+    # คิวทั้งช่วงวันที่ แยกตาม (วันที่, พนักงาน)
+    existing: Dict[date, Dict[int, List[Appointment]]] = defaultdict(lambda: defaultdict(list))
+    for ap in session.exec(
+        select(Appointment).where(
+            Appointment.date >= date_from,
+            Appointment.date <= date_to,
+            Appointment.staff_id.in_(staff_ids),
+            Appointment.status != "canceled"
+        )
+    ).all():
+        existing[ap.date][ap.staff_id].append(ap)
+    for hold in session.exec(
+        select(SlotHold).where(
+            SlotHold.date >= date_from,
+            SlotHold.date <= date_to,
+            SlotHold.staff_id.in_(staff_ids),
+            SlotHold.expires_at > datetime.utcnow()
+        )
+    ).all():
+        existing[hold.date][hold.staff_id].append(hold)
+
+    result = []
+    for d in days:
+        weekday = d.weekday()
+        bh = reference.business_hours_for(session, weekday)
+        schedules = reference.working_schedules(session, weekday, staff_ids)
+        if not bh or not schedules:
+            result.append({"date": d.isoformat(), "slots": []})
+            continue
+        result.append({
+            "date": d.isoformat(),
+            "slots": build_day_slots(d, service, schedules, bh, existing.get(d, {})),
+        })
+
+    return ORJSONResponse({
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "service_id": service_id,
+        "service": service.name,
+        "duration_minutes": service.duration_minutes,
+        "days": result,
+    })
+
 @router.post("")
-def create_appointment(ap: Appointment, session: Session = Depends(get_session)):
+async def create_appointment(
+    ap: Appointment,
+    hold: str | None = Query(None, description="token จาก POST /appointments/holds (ถ้ากันช่วงเวลาไว้ก่อน)"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    _parse_appointment_fields(ap)
+    outbox_id = await session.run_sync(_book, ap, hold)
+    await session.commit()
+    await session.refresh(ap)
+    slot_cache.bump_date(ap.date)
+    notifier.submit(outbox_id)
+    publish_appointment("created", appointment_event(ap))
+
+    return ap
+
+def _parse_appointment_fields(ap: Appointment):
+    """Appointment (table model) จาก body ไม่ถูก validate: แปลง date/time ที่เป็น string ในที่เดิม"""
     # แปลง date string เป็น date object ถ้าจำเป็น
     if isinstance(ap.date, str):
         try:
-            from datetime import datetime
             ap.date = datetime.strptime(ap.date, "%Y-%m-%d").date()
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
-    
+
     # แปลง time string เป็น time object ถ้าจำเป็น
     if isinstance(ap.start_time, str):
         try:
             ap.start_time = datetime.strptime(ap.start_time, "%H:%M").time()
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid start_time format. Use HH:MM")
-    
+
     if isinstance(ap.end_time, str):
         try:
             ap.end_time = datetime.strptime(ap.end_time, "%H:%M").time()
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid end_time format. Use HH:MM")
-    
-    # Basic validation: not in holiday, within business hours, no overlap
-    bh = session.exec(select(BusinessHours).where(BusinessHours.weekday == ap.date.weekday())).first()
+
+def _check_calendar(session: Session, d: date, start: time, end: time):
+    # Basic validation: not in holiday, within business hours
+    bh = reference.business_hours_for(session, d.weekday())
     if not bh:
         raise HTTPException(status_code=400, detail="Shop closed on this day")
-    if not (bh.open_time <= ap.start_time and ap.end_time <= bh.close_time):
+    if not (bh.open_time <= start and end <= bh.close_time):
         raise HTTPException(status_code=400, detail="Outside business hours")
     # Holiday check
-    if session.exec(select(Holiday).where(Holiday.date == ap.date)).first():
+    if d in reference.holiday_dates(session):
         raise HTTPException(status_code=400, detail="Holiday")
-    # Overlap check
-    exist = session.exec(select(Appointment).where(Appointment.date == ap.date, Appointment.status != "canceled")).all()
-    for e in exist:
-        if max(ap.start_time, e.start_time) < min(ap.end_time, e.end_time):
-            raise HTTPException(status_code=400, detail="Time slot already booked")
+
+def _lock_and_check(session: Session, staff_id: int, d: date, start: time, end: time, hold: str | None = None):
+    # Overlap check: ล็อกพนักงาน/วันนี้ก่อน แล้วค่อยเช็คคิวทับซ้อน (ใช้ index staff_id+date+start_time)
+    # คำขอพร้อมกันของพนักงานคนเดียวกันจะรอจนอีกฝั่ง commit จึงไม่มีใครผ่านการเช็คซ้อนกันได้
+    if lock_staff_day(session, staff_id, d) is None:
+        raise HTTPException(status_code=400, detail="Staff not found")
+    if has_conflict(session, staff_id, d, start, end, ignore_hold=hold):
+        raise HTTPException(status_code=400, detail="Time slot already booked")
+
+def _new_appointment_message(ap: Appointment) -> str:
+    return f"📅 คิวใหม่: #{ap.id} {ap.date} {ap.start_time}-{ap.end_time}\n👤 {ap.customer_name} ({ap.customer_phone})\nหมายเหตุ: {ap.note or '-'}"
+
+def _book(session: Session, ap: Appointment, hold: str | None = None) -> int | None:
+    """ตรวจสอบและเพิ่มคิวใน transaction ของ session (ผู้เรียกเป็นคน commit) คืนค่า id ใน outbox"""
+    _check_calendar(session, ap.date, ap.start_time, ap.end_time)
+    _lock_and_check(session, ap.staff_id, ap.date, ap.start_time, ap.end_time, hold)
 
     session.add(ap)
-    session.commit()
-    session.refresh(ap)
+    if hold:
+        # การกันถูกใช้แล้ว (ถ้าหมดอายุไปก่อนก็แค่ไม่มีแถวให้ลบ)
+        session.exec(delete(SlotHold).where(SlotHold.token == hold))
+    session.flush()
+
+    # Notify admin via LINE (optional) — บันทึกลง outbox ใน transaction เดียวกัน แล้วส่งเบื้องหลัง
+    return notifier.enqueue(session, _new_appointment_message(ap))
+
+def _service_end(session: Session, service_id: int, d: date, start: time, end: time | None) -> time:
+    """ตรวจบริการ แล้วคืนเวลาสิ้นสุด (ถ้าไม่ระบุ = เวลาเริ่ม + ระยะเวลาของบริการ)"""
+    service = reference.get_service(session, service_id)
+    if not service or not service.is_active:
+        raise HTTPException(status_code=400, detail="Service not found")
+    if end is None:
+        end_dt = datetime.combine(d, start) + timedelta(minutes=service.duration_minutes)
+        if end_dt.date() != d:
+            raise HTTPException(status_code=400, detail="Appointment must end on the same day")
+        end = end_dt.time()
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start_time must be before end_time")
+    return end
 
-    # Notify admin via LINE (optional)
-    msg = f"📅 คิวใหม่: #{ap.id} {ap.date} {ap.start_time}-{ap.end_time}\n👤 {ap.customer_name} ({ap.customer_phone})\nหมายเหตุ: {ap.note or '-'}"
-    send_line_notify(settings.line_notify_token, msg)
+def _book_any(session: Session, req: AnyStaffAppointmentRequest, strategy: str) -> Tuple[Appointment, int | None]:
+    """เลือกพนักงานที่ว่างตามกลยุทธ์แล้วเพิ่มคิว ใน transaction ของ session (ผู้เรียกเป็นคน commit)"""
+    end_time = _service_end(session, req.service_id, req.date, req.start_time, req.end_time)
+    _check_calendar(session, req.date, req.start_time, end_time)
+    staff_ids = reference.staff_ids_for_service(session, req.service_id)
+    schedules = [
+        sc for sc in reference.working_schedules(session, req.date.weekday(), staff_ids)
+        if sc.open_time <= req.start_time and end_time <= sc.close_time
+    ]
+    # ล็อกผู้สมัครทุกคนตามลำดับ แล้วอ่านคิว/การกันภายใต้ล็อก: ไม่มีใครจองแทรกระหว่างเลือก
+    locked = lock_staff_days(session, [(sc.staff_id, req.date) for sc in schedules])
+    schedules = [sc for sc in schedules if (sc.staff_id, req.date) in locked]
+    keys = [(sc.staff_id, req.date) for sc in schedules]
+    appointments = [row for row in staff_day_appointments(session, keys) if row.status != "canceled"]
+    holds = active_holds(session, req.date, [sc.staff_id for sc in schedules], for_update=True)
+    chosen = choose_staff(strategy, build_staff_days(schedules, appointments, holds), req.start_time, end_time, req.service_id)
+    if chosen is None:
+        raise HTTPException(status_code=400, detail="No staff available at this time")
 
+    ap = Appointment(
+        customer_name=req.customer_name,
+        customer_phone=req.customer_phone,
+        date=req.date,
+        start_time=req.start_time,
+        end_time=end_time,
+        service_id=req.service_id,
+        staff_id=chosen.staff_id,
+        note=req.note,
+    )
+    session.add(ap)
+    session.flush()
+    return ap, notifier.enqueue(session, _new_appointment_message(ap))
+
+@router.post("/any")
+async def create_appointment_any_staff(
+    req: AnyStaffAppointmentRequest,
+    strategy: str | None = Query(None, description="least_loaded | round_robin | fewest_gaps (ค่าเริ่มต้นจาก STAFF_ASSIGN_STRATEGY)"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """จองโดยไม่ระบุพนักงาน: ระบบเลือกพนักงานที่ทำบริการนี้และว่างช่วงเวลานั้นให้"""
+    strategy = strategy or settings.staff_assign_strategy
+    if strategy not in STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy '{strategy}'")
+    ap, outbox_id = await session.run_sync(_book_any, req, strategy)
+    await session.commit()
+    await session.refresh(ap)
+    slot_cache.bump_date(ap.date)
+    notifier.submit(outbox_id)
+    publish_appointment("created", appointment_event(ap))
     return ap
 
+def _hold(session: Session, req: SlotHoldRequest) -> SlotHold:
+    """ตรวจเหมือนการจองแล้วกันช่วงเวลาไว้ใน transaction ของ session (ผู้เรียกเป็นคน commit)"""
+    end_time = _service_end(session, req.service_id, req.date, req.start_time, req.end_time)
+    if req.staff_id not in reference.staff_ids_for_service(session, req.service_id):
+        raise HTTPException(status_code=400, detail="Staff does not provide this service")
+    _check_calendar(session, req.date, req.start_time, end_time)
+    _lock_and_check(session, req.staff_id, req.date, req.start_time, end_time)
+
+    hold = SlotHold(
+        token=uuid.uuid4().hex,
+        staff_id=req.staff_id,
+        service_id=req.service_id,
+        date=req.date,
+        start_time=req.start_time,
+        end_time=end_time,
+        expires_at=datetime.utcnow() + timedelta(minutes=settings.slot_hold_minutes),
+    )
+    session.add(hold)
+    session.flush()
+    return hold
+
+@router.post("/holds")
+async def create_hold(request: Request, req: SlotHoldRequest, session: AsyncSession = Depends(get_async_session)):
+    """กันช่วงเวลาไว้ SLOT_HOLD_MINUTES นาทีระหว่างกรอกข้อมูล แล้วจองด้วย POST /appointments?hold=<token>"""
+    ip = request.client.host if request.client else "unknown"
+    retry_after = hold_limiter.retry_after(ip)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many holds, please try again later",
+            headers={"Retry-After": str(int(retry_after) + 1)},
+        )
+    hold_limiter.hit(ip)
+
+    hold = await session.run_sync(_hold, req)
+    event = hold_event(hold)
+    token, hold_id, expires_at = hold.token, hold.id, hold.expires_at
+    await session.commit()
+    slot_cache.bump_date(req.date)
+    hold_reaper.schedule(hold_id, expires_at)
+    publish_hold("held", event)
+    return {"token": token, "expires_at": expires_at.isoformat() + "Z", **event}
+
+@router.delete("/holds/{token}")
+async def release_hold(token: str, session: AsyncSession = Depends(get_async_session)):
+    """ปล่อยช่วงเวลาที่กันไว้ (เช่น ลูกค้าเปลี่ยนใจเลือกเวลาอื่น)"""
+    hold = (await session.exec(select(SlotHold).where(SlotHold.token == token))).first()
+    if not hold:
+        raise HTTPException(status_code=404, detail="Not found")
+    event, hold_date = hold_event(hold), hold.date
+    await session.delete(hold)
+    await session.commit()
+    slot_cache.bump_date(hold_date)
+    publish_hold("released", event)
+    return {"ok": True}
+
+@router.post("/import")
+async def import_appointments(
+    request: Request,
+    notify: str = Query("summary", pattern="^(none|summary|each)$", description="LINE Notify: none | summary (ข้อความเดียว) | each"),
+    all_or_nothing: bool = Query(False, description="ถ้ามีแถวที่ผิดแม้แถวเดียว จะไม่เพิ่มคิวใดเลย"),
+    dry_run: bool = Query(False, description="ตรวจอย่างเดียว ไม่บันทึก"),
+    session: AsyncSession = Depends(get_async_session),
+    _: None = Depends(require_admin),
+):
+    """นำเข้าคิวจาก JSON (array) หรือ CSV (Content-Type: text/csv, header เหมือน /appointments/export)"""
+    try:
+        rows = bulk_import.parse_rows(await request.body(), request.headers.get("content-type", ""))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise HTTPException(status_code=413, detail=f"Too many rows (max {MAX_IMPORT_ROWS})")
+
+    result = await session.run_sync(bulk_import.import_appointments, rows, notify)
+    errors = result["errors"]
+    if dry_run or (all_or_nothing and errors):
+        await session.rollback()
+        if not dry_run:
+            raise HTTPException(status_code=400, detail={"message": "Import rejected", "errors": errors})
+        return {"received": len(rows), "inserted": 0, "valid": result["inserted"], "failed": len(errors), "errors": errors, "dry_run": True}
+
+    await session.commit()
+    slot_cache.bump_date(*result["dates"])
+    for outbox_id in result["outbox_ids"]:
+        notifier.submit(outbox_id)
+    if result["dates"]:
+        publish_dates_changed("imported", result["dates"], inserted=result["inserted"])
+    return {"received": len(rows), "inserted": result["inserted"], "failed": len(errors), "errors": errors, "dry_run": False}
+
 @router.post("/{ap_id}/confirm")
 def confirm(ap_id: int, session: Session = Depends(get_session), _: None = Depends(require_admin)):
     ap = session.get(Appointment, ap_id)
     if not ap:
         raise HTTPException(status_code=404, detail="Not found")
     ap.status = "confirmed"
+    ap_date = ap.date
     session.add(ap)
+    outbox_id = notifier.enqueue(session, f"✅ ยืนยันคิว #{ap.id} {ap.date} {ap.start_time}-{ap.end_time}")
+    event = appointment_event(ap)
     session.commit()
-
-    send_line_notify(settings.line_notify_token, f"✅ ยืนยันคิว #{ap.id} {ap.date} {ap.start_time}-{ap.end_time}")
+    slot_cache.bump_date(ap_date)
+    notifier.submit(outbox_id)
+    publish_appointment("confirmed", event)
 
     return {"ok": True}
 
@@ -198,9 +621,13 @@ def cancel(ap_id: int, session: Session = Depends(get_session), _: None = Depend
     if not ap:
         raise HTTPException(status_code=404, detail="Not found")
     ap.status = "canceled"
+    ap_date = ap.date
     session.add(ap)
+    outbox_id = notifier.enqueue(session, f"❌ ยกเลิกคิว #{ap.id} {ap.date} {ap.start_time}-{ap.end_time}")
+    event = appointment_event(ap)
     session.commit()
-
-    send_line_notify(settings.line_notify_token, f"❌ ยกเลิกคิว #{ap.id} {ap.date} {ap.start_time}-{ap.end_time}")
+    slot_cache.bump_date(ap_date)
+    notifier.submit(outbox_id)
+    publish_appointment("canceled", event)
 
     return {"ok": True}
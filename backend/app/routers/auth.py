@@ -1,19 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
-from ..database import get_session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..database import get_async_session
 from ..models import User
-from ..security import create_access_token, verify_password, get_password_hash
+from ..security import create_access_token, invalidate_user_tokens, verify_and_update_password_async, PasswordHasherBusy
+from ..throttle import SlidingWindowLimiter
 from ..core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# ต่อ IP นับทุกครั้งที่พยายาม login, ต่อบัญชีนับเฉพาะครั้งที่ผิด (ล้างเมื่อ login สำเร็จ)
+ip_limiter = SlidingWindowLimiter(settings.login_ip_limit, settings.login_ip_window)
+account_limiter = SlidingWindowLimiter(settings.login_account_limit, settings.login_account_window)
+
+def _too_many(retry_after: float):
+    raise HTTPException(
+        status_code=429,
+        detail="Too many login attempts, please try again later",
+        headers={"Retry-After": str(int(retry_after) + 1)},
+    )
+
 @router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_async_session)):
     # Admin login only (email/password)
+    ip = request.client.host if request.client else "unknown"
+    account = form_data.username.strip().lower()
+    # ตรวจก่อน hash เพื่อไม่ให้การยิง login จำนวนมากกิน CPU
+    retry_after = max(ip_limiter.retry_after(ip), account_limiter.retry_after(account))
+    if retry_after:
+        _too_many(retry_after)
+    ip_limiter.hit(ip)
+
     statement = select(User).where(User.email == form_data.username)
-    user = session.exec(statement).first()
-    if not user or not user.password_hash or not verify_password(form_data.password, user.password_hash):
+    user = (await session.exec(statement)).first()
+    valid, new_hash = False, None
+    if user and user.password_hash:
+        try:
+            valid, new_hash = await verify_and_update_password_async(form_data.password, user.password_hash)
+        except PasswordHasherBusy:
+            _too_many(1)
+    if not valid:
+        account_limiter.hit(account)
         raise HTTPException(status_code=400, detail="Incorrect email or password")
-    token = create_access_token(subject=str(user.id))
+    account_limiter.reset(account)
+
+    if new_hash:
+        # BCRYPT_ROUNDS เปลี่ยน: เก็บ hash ใหม่ตอนที่รู้รหัสผ่านจริง
+        user.password_hash = new_hash
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+        invalidate_user_tokens(user.id)
+    token = create_access_token(subject=str(user.id), role=user.role)
     return {"access_token": token, "token_type": "bearer", "user": {"id": user.id, "name": user.name, "email": user.email, "role": user.role}}
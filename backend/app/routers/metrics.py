@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from ..deps import require_admin
+from ..core.config import settings
+from ..database import engine, async_engine, pool_stats
+from .. import reference
+from ..slots import slot_cache
+from ..security import token_cache
+from ..holds import hold_reaper
+from .auth import ip_limiter, account_limiter
+from .appointments import hold_limiter
+
+router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(require_admin)])
+
+@router.get("/line-notify")
+def line_notify_metrics():
+    from ..line_notify import get_line_client
+    return get_line_client().stats()
+
+@router.get("/cache")
+def cache_metrics():
+    return {"reference": reference.cache.stats(), "slots": slot_cache.stats(), "tokens": token_cache.stats()}
+
+@router.get("/login")
+def login_metrics():
+    return {"per_ip": ip_limiter.stats(), "per_account": account_limiter.stats()}
+
+@router.get("/holds")
+def hold_metrics():
+    return {"reaper": hold_reaper.stats(), "per_ip": hold_limiter.stats()}
+
+@router.get("/db-pool")
+def db_pool_metrics():
+    return {
+        "pre_ping": settings.db_pool_pre_ping,
+        "recycle_seconds": settings.db_pool_recycle,
+        "sync": pool_stats(engine),
+        "async": pool_stats(async_engine.sync_engine),
+    }
@@ -1,20 +1,24 @@
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import Session
 from ..database import get_session
+from ..schemas import ServiceRead
 from ..models import Service
 from ..deps import require_admin
+from .. import reference
 
 router = APIRouter(prefix="/services", tags=["services"])
 
-@router.get("")
+@router.get("", response_model=List[ServiceRead])
 def list_services(session: Session = Depends(get_session)):
-    return session.exec(select(Service).where(Service.is_active == True)).all()
+    return reference.active_services(session)
 
 @router.post("")
 def create_service(service: Service, session: Session = Depends(get_session), _: None = Depends(require_admin)):
     session.add(service)
     session.commit()
     session.refresh(service)
+    reference.invalidate("services")
     return service
 
 @router.put("/{service_id}")
@@ -29,6 +33,7 @@ def update_service(service_id: int, service: Service, session: Session = Depends
     session.add(db_service)
     session.commit()
     session.refresh(db_service)
+    reference.invalidate("services")
     return db_service
 
 @router.delete("/{service_id}")
@@ -40,4 +45,5 @@ def delete_service(service_id: int, session: Session = Depends(get_session), _:
     service.is_active = False
     session.add(service)
     session.commit()
+    reference.invalidate("services")
     return {"ok": True}
@@ -1,33 +1,55 @@
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session, select
-from sqlalchemy import delete
 from ..database import get_session
 from ..models import BusinessHours, Holiday
 from ..deps import require_admin
+from ..diff import as_date, as_time, changed_keys, sync_rows
+from .. import reference
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
 @router.get("/business-hours")
 def get_business_hours(session: Session = Depends(get_session)):
-    return session.exec(select(BusinessHours)).all()
+    return reference.business_hours(session)
 
 @router.post("/business-hours")
 def set_business_hours(hours: List[BusinessHours], session: Session = Depends(get_session), _: None = Depends(require_admin)):
-    session.exec(delete(BusinessHours))
-    for h in hours:
-        session.add(h)
+    """แทนที่เวลาทำการทั้งชุด แต่เขียนเฉพาะวันที่เปลี่ยน คืนรายการ weekday ที่เพิ่ม/แก้/ลบ"""
+    try:
+        for h in hours:
+            h.weekday = int(h.weekday)
+            h.open_time, h.close_time = as_time(h.open_time), as_time(h.close_time)
+        changes = sync_rows(
+            session, session.exec(select(BusinessHours)).all(), hours,
+            key=lambda h: h.weekday, fields=("open_time", "close_time", "slot_minutes"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     session.commit()
-    return {"ok": True}
+    weekdays = changed_keys(changes)
+    if weekdays:
+        reference.invalidate("business_hours", weekdays=weekdays)
+    return {"ok": True, **changes}
 
 @router.get("/holidays")
 def get_holidays(session: Session = Depends(get_session)):
-    return session.exec(select(Holiday)).all()
+    return reference.holidays(session)
 
 @router.post("/holidays")
 def set_holidays(holidays: List[Holiday], session: Session = Depends(get_session), _: None = Depends(require_admin)):
-    session.exec(delete(Holiday))
-    for h in holidays:
-        session.add(h)
+    """แทนที่วันหยุดทั้งชุด แต่เขียนเฉพาะวันที่เปลี่ยน คืนรายการวันที่ที่เพิ่ม/แก้/ลบ"""
+    try:
+        for h in holidays:
+            h.date = as_date(h.date)
+        changes = sync_rows(
+            session, session.exec(select(Holiday)).all(), holidays,
+            key=lambda h: h.date, fields=("reason",),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     session.commit()
-    return {"ok": True}
+    dates = changed_keys(changes)
+    if dates:
+        reference.invalidate("holidays", dates=dates)
+    return {"ok": True, **changes}
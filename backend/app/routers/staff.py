@@ -1,21 +1,25 @@
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session, select
-from sqlalchemy import delete
+from ..diff import as_time, changed_keys, sync_rows
 from ..database import get_session
+from ..schemas import StaffRead
 from ..models import Staff, StaffService, StaffSchedule
 from ..deps import require_admin
+from .. import reference
 
 router = APIRouter(prefix="/staff", tags=["staff"])
 
-@router.get("")
+@router.get("", response_model=List[StaffRead])
 def list_staff(session: Session = Depends(get_session)):
-    return session.exec(select(Staff).where(Staff.is_active == True)).all()
+    return reference.active_staff(session)
 
 @router.post("")
 def create_staff(staff: Staff, session: Session = Depends(get_session), _: None = Depends(require_admin)):
     session.add(staff)
     session.commit()
     session.refresh(staff)
+    reference.invalidate("staff")
     return staff
 
 @router.put("/{staff_id}")
@@ -30,6 +34,7 @@ def update_staff(staff_id: int, staff: Staff, session: Session = Depends(get_ses
     session.add(db_staff)
     session.commit()
     session.refresh(db_staff)
+    reference.invalidate("staff")
     return db_staff
 
 @router.delete("/{staff_id}")
@@ -41,6 +46,7 @@ def delete_staff(staff_id: int, session: Session = Depends(get_session), _: None
     staff.is_active = False
     session.add(staff)
     session.commit()
+    reference.invalidate("staff")
     return {"ok": True}
 
 @router.get("/{staff_id}/services")
@@ -52,6 +58,7 @@ def assign_service_to_staff(staff_id: int, service_id: int, session: Session = D
     staff_service = StaffService(staff_id=staff_id, service_id=service_id)
     session.add(staff_service)
     session.commit()
+    reference.invalidate("staff_services")
     return staff_service
 
 @router.get("/{staff_id}/schedule")
@@ -60,13 +67,23 @@ def get_staff_schedule(staff_id: int, session: Session = Depends(get_session)):
 
 @router.post("/{staff_id}/schedule")
 def set_staff_schedule(staff_id: int, schedules: list[StaffSchedule], session: Session = Depends(get_session), _: None = Depends(require_admin)):
-    # ลบตารางเดิม
-    session.exec(delete(StaffSchedule).where(StaffSchedule.staff_id == staff_id))
-    
-    # เพิ่มตารางใหม่
-    for schedule in schedules:
-        schedule.staff_id = staff_id
-        session.add(schedule)
-    
+    """แทนที่ตารางของพนักงานทั้งชุด แต่เขียนเฉพาะวันที่เปลี่ยน คืนรายการ weekday ที่เพิ่ม/แก้/ลบ"""
+    try:
+        for schedule in schedules:
+            schedule.staff_id = staff_id
+            schedule.weekday = int(schedule.weekday)
+            schedule.open_time, schedule.close_time = as_time(schedule.open_time), as_time(schedule.close_time)
+        changes = sync_rows(
+            session,
+            session.exec(select(StaffSchedule).where(StaffSchedule.staff_id == staff_id)).all(),
+            schedules,
+            key=lambda sc: sc.weekday,
+            fields=("open_time", "close_time", "is_working"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     session.commit()
-    return {"ok": True}
+    weekdays = changed_keys(changes)
+    if weekdays:
+        reference.invalidate("staff_schedules", weekdays=weekdays)
+    return {"ok": True, **changes}
@@ -0,0 +1,42 @@
+"""รูปแบบข้อมูลที่ส่งออกจาก endpoint (อ่านอย่างเดียว ไม่ใช่ table model)
+
+ใช้เป็น response_model: FastAPI ตรวจและแปลงเป็น JSON ด้วย pydantic-core ทีเดียวทั้งรายการ
+แทนการไล่ jsonable_encoder ทีละ field และ list endpoint select เฉพาะคอลัมน์ที่อยู่ในนี้
+"""
+from datetime import date, datetime, time
+from typing import Optional
+from sqlmodel import SQLModel
+
+class ServiceRead(SQLModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    duration_minutes: int
+    price: Optional[float] = None
+    is_active: bool
+    created_at: datetime
+
+class StaffRead(SQLModel):
+    id: int
+    name: str
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    is_active: bool
+    created_at: datetime
+
+class AppointmentRead(SQLModel):
+    id: int
+    customer_name: str
+    customer_phone: str
+    date: date
+    start_time: time
+    end_time: time
+    service_id: int
+    staff_id: int
+    status: str
+    note: Optional[str] = None
+    created_at: datetime
+
+def columns(entity, schema) -> list:
+    """คอลัมน์ของ entity ตามลำดับ field ใน schema สำหรับ select(*columns(...))"""
+    return [getattr(entity, name) for name in schema.model_fields]
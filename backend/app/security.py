@@ -1,27 +1,148 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from .cache import TokenCache
 from .core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# jose/passlib ถูก import ตอนใช้งานครั้งแรก เพื่อให้แอป (โดยเฉพาะ bundle ของ PyInstaller) เริ่มเร็วขึ้น
 ALGORITHM = "HS256"
 
-def create_access_token(subject: str, expires_minutes: int = 60) -> str:
+token_cache = TokenCache(settings.token_cache_size)
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+def create_access_token(subject: str, role: Optional[str] = None, expires_minutes: int = 60) -> str:
+    from jose import jwt
     now = datetime.utcnow()
     expire = now + timedelta(minutes=expires_minutes)
-    payload = {"sub": subject, "exp": expire}
+    # iat เป็นวินาทีเต็ม (เหมือนที่ได้กลับมาตอน decode) ใช้เทียบกับเวลาที่ revoke
+    payload = {"sub": subject, "iat": int(time.time()), "exp": expire}
+    if role:
+        # ฝัง role ไว้ใน token ให้ require_admin ไม่ต้อง query ผู้ใช้
+        payload["role"] = role
     return jwt.encode(payload, settings.app_secret, algorithm=ALGORITHM)
 
 def decode_access_token(token: str) -> Optional[dict]:
+    from jose import jwt, JWTError
     try:
         payload = jwt.decode(token, settings.app_secret, algorithms=[ALGORITHM])
         return payload
     except JWTError:
         return None
 
+def verify_access_token(token: str) -> Optional[dict]:
+    """decode_access_token + cache: token เดิมไม่ต้องตรวจลายเซ็นซ้ำจนกว่าจะหมดอายุ"""
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    claims = decode_access_token(token)
+    # token ที่มี typ (เช่น ticket ของ stream) ใช้แทน access token ไม่ได้
+    if not claims or not claims.get("sub") or "typ" in claims or token_cache.is_revoked(claims):
+        return None
+    token_cache.put(token, claims)
+    return claims
+
+def invalidate_user_tokens(user_id: int):
+    """เรียกทุกครั้งที่แก้ role/รหัสผ่านหรือลบผู้ใช้ token (และ ticket) ที่ออกก่อนหน้านี้จะใช้ไม่ได้ใน process นี้"""
+    token_cache.revoke_user(user_id)
+
+STREAM_TICKET_TYPE = "stream"
+_used_tickets: Dict[str, float] = {}
+_used_tickets_lock = threading.Lock()
+
+def create_stream_ticket(claims: dict) -> str:
+    """ticket สำหรับเปิด SSE ซึ่งต้องส่งใน URL (ถูกเก็บใน access log) แทน JWT ตัวจริง
+
+    อายุ STREAM_TICKET_SECONDS และใช้ได้ครั้งเดียว (ต่อ process) หลุดไปก็เอาไปเรียก API อื่นไม่ได้
+    """
+    from jose import jwt
+    payload = {
+        "sub": claims["sub"],
+        "typ": STREAM_TICKET_TYPE,
+        "jti": uuid.uuid4().hex,
+        # iat ของ access token ต้นทาง: revoke ผู้ใช้แล้ว ticket ที่ขอไว้ก็ใช้ไม่ได้ด้วย
+        "iat": int(claims.get("iat", 0)),
+        "exp": datetime.utcnow() + timedelta(seconds=settings.stream_ticket_seconds),
+    }
+    if claims.get("role"):
+        payload["role"] = claims["role"]
+    return jwt.encode(payload, settings.app_secret, algorithm=ALGORITHM)
+
+def verify_stream_ticket(ticket: str) -> Optional[dict]:
+    claims = decode_access_token(ticket)
+    if not claims or claims.get("typ") != STREAM_TICKET_TYPE or not claims.get("jti") or token_cache.is_revoked(claims):
+        return None
+    now = time.time()
+    with _used_tickets_lock:
+        for jti in [j for j, exp in _used_tickets.items() if exp <= now]:
+            del _used_tickets[jti]
+        if claims["jti"] in _used_tickets:
+            return None
+        _used_tickets[claims["jti"]] = claims["exp"]
+    return claims
+
 def verify_password(plain_password: str, password_hash: str) -> bool:
-    return pwd_context.verify(plain_password, password_hash)
+    return get_pwd_context().verify(plain_password, password_hash)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+def verify_and_update_password(plain_password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """ตรวจรหัสผ่าน และคืน hash ใหม่ถ้า hash เดิมใช้ cost/scheme ไม่ตรงกับการตั้งค่าปัจจุบัน"""
+    return get_pwd_context().verify_and_update(plain_password, password_hash)
+
+class PasswordHasherBusy(Exception):
+    """มีงานตรวจรหัสผ่านค้างอยู่เกิน password_hash_max_pending"""
+
+_hash_pool: Optional[Executor] = None
+_hash_pool_lock = threading.Lock()
+_pending = 0
+
+def _get_hash_pool() -> Optional[Executor]:
+    global _hash_pool
+    if settings.password_hash_workers <= 0:
+        return None
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # spawn: ไม่ fork process ที่มี thread อยู่แล้ว (notifier, connection pool)
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _hash_pool
+
+def shutdown_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+async def verify_and_update_password_async(plain_password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password ใน process pool แยก (bcrypt ใช้ CPU ~ร้อย ms ต่อครั้ง)
+
+    ไม่กิน threadpool/GIL ที่ใช้ตอบ request อื่น งานที่รอเกิน password_hash_max_pending ถูกปฏิเสธทันที
+    """
+    global _pending
+    if _pending >= settings.password_hash_max_pending:
+        raise PasswordHasherBusy()
+    _pending += 1
+    try:
+        pool = _get_hash_pool()
+        if pool is None:
+            from starlette.concurrency import run_in_threadpool
+            return await run_in_threadpool(verify_and_update_password, plain_password, password_hash)
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, verify_and_update_password, plain_password, password_hash
+        )
+    finally:
+        _pending -= 1
@@ -0,0 +1,110 @@
+"""ข้อมูลเริ่มต้น (admin, เวลาทำการ, บริการ, พนักงาน, ตารางงาน) — รันซ้ำได้โดยไม่เพิ่มข้อมูลซ้ำ
+
+ใช้ผ่าน `python -m app.cli seed` (ไม่ได้รันตอนเริ่มแอปแล้ว)
+"""
+from datetime import time
+from typing import Callable, List
+from sqlmodel import Session, select
+from .core.config import settings
+from .models import BusinessHours, Service, Staff, StaffSchedule, StaffService, User
+
+DEFAULT_SERVICES = [
+    dict(name="ตัดผม", description="ตัดผมชาย", duration_minutes=30, price=100),
+    dict(name="สระไดร์", description="สระไดร์", duration_minutes=60, price=200),
+    dict(name="ทำเล็บ", description="ทำเล็บ", duration_minutes=45, price=150),
+]
+DEFAULT_STAFF = [
+    dict(name="พนักงาน 1", phone="081-234-5678"),
+    dict(name="พนักงาน 2", phone="082-345-6789"),
+]
+# พนักงาน 1 ทำได้ทุกบริการ, พนักงาน 2 ทำได้แค่ตัดผมและสระไดร์ (index ใน DEFAULT_STAFF -> DEFAULT_SERVICES)
+DEFAULT_STAFF_SERVICES = {0: [0, 1, 2], 1: [0, 1]}
+WORKDAYS = range(0, 6)  # Mon-Sat
+OPEN_TIME = time(9, 0)
+CLOSE_TIME = time(17, 0)
+
+def seed_admin(session: Session) -> int:
+    if session.exec(select(User.id).where(User.email == settings.admin_email)).first() is not None:
+        return 0
+    from .security import get_password_hash
+    session.add(User(
+        name="Administrator",
+        email=settings.admin_email,
+        role="admin",
+        password_hash=get_password_hash(settings.admin_password),
+        phone="",
+    ))
+    return 1
+
+def seed_business_hours(session: Session) -> int:
+    if session.exec(select(BusinessHours.id)).first() is not None:
+        return 0
+    session.add_all([
+        BusinessHours(weekday=wd, open_time=OPEN_TIME, close_time=CLOSE_TIME, slot_minutes=30)
+        for wd in WORKDAYS
+    ])
+    return len(WORKDAYS)
+
+def seed_services(session: Session) -> int:
+    """เพิ่มบริการเริ่มต้นที่ยังไม่มี (เทียบตามชื่อ)"""
+    existing = set(session.exec(select(Service.name)).all())
+    missing = [Service(**s) for s in DEFAULT_SERVICES if s["name"] not in existing]
+    session.add_all(missing)
+    return len(missing)
+
+def seed_staff(session: Session) -> int:
+    if session.exec(select(Staff.id)).first() is not None:
+        return 0
+    session.add_all([Staff(**s) for s in DEFAULT_STAFF])
+    return len(DEFAULT_STAFF)
+
+def seed_staff_services(session: Session) -> int:
+    if session.exec(select(StaffService.id)).first() is not None:
+        return 0
+    staff = _by_name(session, Staff, DEFAULT_STAFF)
+    services = _by_name(session, Service, DEFAULT_SERVICES)
+    links = [
+        StaffService(staff_id=staff[si].id, service_id=services[vi].id)
+        for si, service_indexes in DEFAULT_STAFF_SERVICES.items()
+        for vi in service_indexes
+        if staff[si] and services[vi]
+    ]
+    session.add_all(links)
+    return len(links)
+
+def seed_staff_schedules(session: Session) -> int:
+    if session.exec(select(StaffSchedule.id)).first() is not None:
+        return 0
+    schedules = [
+        StaffSchedule(staff_id=person.id, weekday=wd, open_time=OPEN_TIME, close_time=CLOSE_TIME, is_working=True)
+        for person in session.exec(select(Staff).where(Staff.is_active == True).order_by(Staff.id)).all()
+        for wd in WORKDAYS
+    ]
+    session.add_all(schedules)
+    return len(schedules)
+
+def _by_name(session: Session, model, defaults: List[dict]) -> list:
+    rows = {r.name: r for r in session.exec(select(model)).all()}
+    return [rows.get(d["name"]) for d in defaults]
+
+# ลำดับสำคัญ: ความสัมพันธ์/ตารางงานต้องมาหลังพนักงานและบริการ
+SEEDERS: List[Callable[[Session], int]] = [
+    seed_admin,
+    seed_business_hours,
+    seed_services,
+    seed_staff,
+    seed_staff_services,
+    seed_staff_schedules,
+]
+
+def reset(session: Session):
+    """ลบข้อมูลตั้งค่าทั้งหมด (ไม่ลบคิวและผู้ใช้) ตามลำดับ foreign key"""
+    for model in (StaffService, StaffSchedule, Service, Staff, BusinessHours):
+        session.exec(model.__table__.delete())
+
+def run_seed(session: Session) -> dict:
+    counts = {}
+    for seeder in SEEDERS:
+        counts[seeder.__name__.removeprefix("seed_")] = seeder(session)
+        session.commit()
+    return counts
@@ -0,0 +1,145 @@
+"""Slot engine: สร้างช่วงเวลาให้จองจากตารางพนักงานและคิวที่มีอยู่แล้ว (ไม่ query ฐานข้อมูล)"""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Tuple
+from .cache import SlotCache
+from .core.config import settings
+from .models import Appointment, BusinessHours, Service, StaffSchedule
+
+Interval = Tuple[time, time]
+
+# ผลลัพธ์ get_slots ที่คำนวณแล้ว (ดู SlotCache)
+slot_cache = SlotCache(settings.slot_cache_ttl, settings.slot_cache_size)
+
+def overlap(a_start: time, a_end: time, b_start: time, b_end: time) -> bool:
+    return max(a_start, b_start) < min(a_end, b_end)
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """เรียงช่วงเวลาตามเวลาเริ่มและรวมช่วงที่ทับกันจริง (ช่วงที่แค่ชนขอบจะไม่ถูกรวม)
+
+    ช่วงที่ยาวศูนย์หรือติดลบถูกตัดทิ้ง เพราะ overlap() ไม่มีทางชนกับช่วงเหล่านั้น
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(iv for iv in intervals if iv[0] < iv[1]):
+        if merged and start < merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def build_day_slots(
+    d: date,
+    service: Service,
+    schedules: List[StaffSchedule],
+    bh: BusinessHours,
+    existing_by_staff: Dict[int, List[Appointment]],
+) -> List[dict]:
+    """สร้าง slots ของหนึ่งวัน
+
+    คิวของพนักงานแต่ละคนถูกเรียงและรวมครั้งเดียว แล้วไล่ slot ไปพร้อมกับ pointer
+    ของช่วงที่จองแล้ว (two-pointer) จึงใช้เวลา O(slots + appointments) ต่อพนักงาน
+    ผลลัพธ์เหมือนการเช็ค overlap() กับทุกคิวทุก slot
+    """
+    slots = []
+    step = timedelta(minutes=bh.slot_minutes)
+    service_duration = timedelta(minutes=service.duration_minutes)
+    for schedule in schedules:
+        start = datetime.combine(d, schedule.open_time)
+        end = datetime.combine(d, schedule.close_time)
+        booked = merge_intervals(
+            (ap.start_time, ap.end_time) for ap in existing_by_staff.get(schedule.staff_id, [])
+        )
+
+        i = 0
+        t = start
+        while t + service_duration <= end:
+            slot_start = t.time()
+            slot_end = (t + service_duration).time()
+
+            # ข้ามช่วงที่จบก่อน slot นี้เริ่ม (slot ถัดไปเริ่มช้ากว่าเสมอ จึงไม่ต้องย้อนกลับ)
+            while i < len(booked) and booked[i][1] <= slot_start:
+                i += 1
+            conflict = slot_start < slot_end and i < len(booked) and booked[i][0] < slot_end
+
+            slots.append({
+                "start": slot_start.strftime("%H:%M"),
+                "end": slot_end.strftime("%H:%M"),
+                "available": not conflict,
+                "staff_id": schedule.staff_id,
+                "service_id": service.id,
+                "duration_minutes": service.duration_minutes
+            })
+
+            t += step
+    return slots
+
+def any_staff_view(slots: List[dict]) -> List[dict]:
+    """รวม slots ของทุกพนักงานเป็นหนึ่งแถวต่อช่วงเวลา (สำหรับจองแบบไม่ระบุพนักงาน)
+
+    available = มีอย่างน้อยหนึ่งคนว่าง, staff_available = จำนวนคนที่ว่าง เรียงตามเวลาเริ่ม
+    """
+    merged: Dict[Tuple[str, str], dict] = {}
+    for slot in slots:
+        key = (slot["start"], slot["end"])
+        row = merged.get(key)
+        if row is None:
+            row = merged[key] = {
+                "start": slot["start"],
+                "end": slot["end"],
+                "available": False,
+                "staff_available": 0,
+                "service_id": slot["service_id"],
+                "duration_minutes": slot["duration_minutes"],
+            }
+        if slot["available"]:
+            row["available"] = True
+            row["staff_available"] += 1
+    return [merged[k] for k in sorted(merged)]
+
+# Accept header ที่ขอรูปแบบย่อ (เทียบเท่า ?format=compact)
+COMPACT_MEDIA_TYPE = "application/vnd.queue-booking.slots+json"
+
+def _to_minutes(hhmm: str) -> int:
+    return int(hhmm[:2]) * 60 + int(hhmm[3:5])
+
+def free_runs(slots: Iterable[dict], step_minutes: int) -> List[list]:
+    """เวลาเริ่มของ slot ที่ว่างแบบ run-length: [[เวลาเริ่ม, จำนวน slot ติดกันทีละ step], ...]"""
+    runs: List[list] = []
+    prev = None
+    for slot in slots:
+        if not slot["available"]:
+            prev = None
+            continue
+        t = _to_minutes(slot["start"])
+        if prev is not None and t - prev == step_minutes:
+            runs[-1][1] += 1
+        else:
+            runs.append([slot["start"], 1])
+        prev = t
+    return runs
+
+def compact_slots(payload: dict, view: str = "staff") -> dict:
+    """รูปแบบย่อของผลลัพธ์ get_slots: ข้อมูลที่ซ้ำทุก slot อยู่ใน header ครั้งเดียว และส่งเฉพาะช่วงที่ว่าง
+
+    slot ที่ i ของ run [start, n] เริ่มที่ start + i * step_minutes และยาว duration_minutes
+    """
+    result = {
+        "format": "compact",
+        "date": payload["date"],
+        "service_id": payload.get("service_id"),
+        "service": payload.get("service"),
+        "duration_minutes": payload.get("duration_minutes"),
+        "step_minutes": payload.get("step_minutes"),
+    }
+    if "message" in payload:
+        result["message"] = payload["message"]
+    slots = payload["slots"]
+    step = payload.get("step_minutes") or 0
+    if view == "any":
+        result["free"] = free_runs(any_staff_view(slots), step)
+        return result
+    by_staff: Dict[int, List[dict]] = {}
+    for slot in slots:
+        by_staff.setdefault(slot["staff_id"], []).append(slot)
+    result["staff"] = [{"staff_id": staff_id, "free": free_runs(rows, step)} for staff_id, rows in by_staff.items()]
+    return result
@@ -0,0 +1,68 @@
+"""จำกัดจำนวนครั้งแบบ sliding window ในหน่วยความจำ (ต่อ process)"""
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable
+
+class SlidingWindowLimiter:
+    """นับเหตุการณ์ต่อ key ภายใน window วินาทีล่าสุด
+
+    retry_after() คืนจำนวนวินาทีที่ต้องรอ (0 = ยังไม่เกินกำหนด) limit <= 0 คือปิดการจำกัด
+    key ที่ไม่มีเหตุการณ์ใน window แล้วถูกลบทิ้งเป็นระยะ หน่วยความจำจึงไม่โตตามจำนวน IP ที่เคยเห็น
+    """
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._events: Dict[Hashable, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+        self.rejected = 0
+
+    def _trim(self, key: Hashable, now: float) -> Deque[float]:
+        events = self._events.get(key)
+        if events is None:
+            return deque()
+        while events and events[0] <= now - self.window:
+            events.popleft()
+        if not events:
+            del self._events[key]
+        return events
+
+    def _prune(self, now: float):
+        if now - self._last_prune < self.window:
+            return
+        self._last_prune = now
+        for key in list(self._events):
+            self._trim(key, now)
+
+    def retry_after(self, key: Hashable) -> float:
+        if self.limit <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            events = self._trim(key, now)
+            if len(events) < self.limit:
+                return 0.0
+            self.rejected += 1
+            return max(events[0] + self.window - now, 0.0)
+
+    def hit(self, key: Hashable):
+        if self.limit <= 0:
+            return
+        with self._lock:
+            self._events.setdefault(key, deque()).append(time.monotonic())
+
+    def reset(self, key: Hashable):
+        with self._lock:
+            self._events.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "window_seconds": self.window,
+                "tracked_keys": len(self._events),
+                "rejected": self.rejected,
+            }
@@ -0,0 +1 @@
+"""benchmark ของ backend (ไม่รันใน pytest) รันจากโฟลเดอร์ backend/ เช่น `python -m bench.slots`"""
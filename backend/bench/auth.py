@@ -0,0 +1,67 @@
+"""auth benchmark: เวลาตรวจสิทธิ์แอดมินต่อ request (ไม่รวม routing/HTTP)
+
+    python -m bench.auth                  # SQLite ชั่วคราว
+    python -m bench.auth --repeat 20000
+
+เดิม (decode JWT + query User ทุก request) เทียบกับ verify_access_token ตอน cache miss
+(ตรวจลายเซ็น + ตรวจ revoke, role จาก token) และ cache hit (ตรวจ exp/revoke ใน dict)
+"""
+import argparse
+import os
+import tempfile
+import time
+
+def _per_call_us(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    if not os.environ.get("DATABASE_URL"):
+        tmp = tempfile.mkdtemp(prefix="queue-booking-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+
+    from sqlmodel import Session, select
+    from app import database
+    from app.cli import main as cli_main
+    from app.deps import _check_admin
+    from app.models import User
+    from app.security import create_access_token, decode_access_token, token_cache, verify_access_token
+
+    cli_main(["init"])
+    with Session(database.engine) as session:
+        admin_id = session.exec(select(User.id).where(User.role == "admin")).first()
+        token = create_access_token(str(admin_id), role="admin")
+
+        def before():
+            claims = decode_access_token(token)
+            user = session.get(User, int(claims["sub"]))
+            session.expunge(user)  # ให้ query จริงทุกรอบ ไม่ใช้ identity map
+            assert user.role == "admin"
+
+        def miss():
+            token_cache._data.clear()
+            _check_admin(verify_access_token(token), session)
+
+        def hit():
+            _check_admin(verify_access_token(token), session)
+
+        results = [
+            ("เดิม: decode + query User", _per_call_us(before, args.repeat)),
+            ("verify_access_token (cache miss)", _per_call_us(miss, args.repeat)),
+            ("verify_access_token (cache hit)", _per_call_us(hit, args.repeat)),
+        ]
+    baseline = results[0][1]
+    print(f"{os.environ['DATABASE_URL'].split(':')[0]}, {args.repeat} รอบ")
+    for name, us in results:
+        print(f"  {name:<34} {us:8.1f} µs/request  ({baseline / us:.1f}x)")
+
+if __name__ == "__main__":
+    main()
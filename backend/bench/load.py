@@ -0,0 +1,191 @@
+"""load benchmark: requests/วินาที ของ get_slots และ create_appointment แบบ sync (ก่อนย้าย) เทียบกับ async
+
+    python -m bench.load                                    # SQLite ชั่วคราว
+    python -m bench.load --concurrency 100 --requests 2000
+    DATABASE_URL=mysql+pymysql://... ASYNC_DATABASE_URL=mysql+aiomysql://... python -m bench.load
+
+ถ้าตั้ง DATABASE_URL เอง ต้องเป็นฐานข้อมูลว่างสำหรับทดสอบเท่านั้น (benchmark เพิ่มพนักงานและคิวลงไป)
+เส้นทาง sync คือ handler แบบ def + Session เหมือนก่อนย้าย ใช้ logic เดียวกัน (_compute_slots, _book)
+จึงต่างกันแค่รูปแบบ I/O: sync ถูกจำกัดด้วย threadpool ของ Starlette, async รอ I/O บน event loop
+SQLite แทบไม่มีเวลารอ I/O ให้ประหยัด ต้องใช้ MySQL ผ่านเครือข่ายจึงเห็นความต่างจริง
+slot cache ถูกปิด (SLOT_CACHE_TTL=0) ทั้งสองฝั่งคำนวณ slots ทุก request
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time as _time
+from datetime import date, datetime, time, timedelta
+from typing import List, Tuple
+
+BENCH_STAFF = 20
+
+def _sync_router():
+    """handler แบบ sync ก่อนย้ายเป็น async (mount ที่ /bench/sync ใน process ของ server เท่านั้น)"""
+    from fastapi import APIRouter, Depends, Query
+    from sqlmodel import Session
+    from app.database import get_session
+    from app.models import Appointment
+    from app.notifier import notifier
+    from app.pubsub import appointment_event, publish_appointment
+    from app.routers.appointments import _book, _compute_slots, _parse_appointment_fields
+    from app.slots import slot_cache
+
+    router = APIRouter(prefix="/bench/sync")
+
+    @router.get("/slots")
+    def get_slots(d: date = Query(...), service_id: int = Query(...), session: Session = Depends(get_session)):
+        return _compute_slots(session, d, service_id)
+
+    @router.post("/appointments")
+    def create_appointment(ap: Appointment, session: Session = Depends(get_session)):
+        _parse_appointment_fields(ap)
+        outbox_id = _book(session, ap)
+        session.commit()
+        session.refresh(ap)
+        slot_cache.bump_date(ap.date)
+        notifier.submit(outbox_id)
+        publish_appointment("created", appointment_event(ap))
+        return ap
+
+    return router
+
+def serve(port: int):
+    import uvicorn
+    from app.main import app
+    app.include_router(_sync_router())
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", ws="none")
+
+def _prepare() -> Tuple[date, List[Tuple[date, int, time, time]]]:
+    """init ฐานข้อมูล เพิ่มพนักงานของ benchmark แล้วคืน (วันที่ใช้ดู slots, ช่วงเวลาว่างสำหรับจอง)"""
+    from sqlmodel import Session, select
+    from app import database
+    from app.cli import main as cli_main
+    from app.models import BusinessHours, Holiday, Staff, StaffSchedule, StaffService
+
+    cli_main(["init"])
+    with Session(database.engine) as session:
+        staff = [Staff(name=f"bench staff {i}") for i in range(BENCH_STAFF)]
+        session.add_all(staff)
+        session.flush()
+        staff_ids = [s.id for s in staff]
+        for sid in staff_ids:
+            session.add(StaffService(staff_id=sid, service_id=1))
+            session.add_all([StaffSchedule(staff_id=sid, weekday=wd, open_time=time(9), close_time=time(17)) for wd in range(7)])
+        session.commit()
+        hours = {bh.weekday: bh for bh in session.exec(select(BusinessHours)).all()}
+        holidays = set(session.exec(select(Holiday.date)).all())
+
+    plan = []
+    slots_day = None
+    d = date.today() + timedelta(days=1)
+    while len(plan) < 200_000 and d < date.today() + timedelta(days=3650):
+        bh = hours.get(d.weekday())
+        if bh and d not in holidays:
+            slots_day = slots_day or d
+            t = datetime.combine(d, max(bh.open_time, time(9)))
+            close = datetime.combine(d, min(bh.close_time, time(17)))
+            while t + timedelta(minutes=30) <= close:
+                plan.extend((d, sid, t.time(), (t + timedelta(minutes=30)).time()) for sid in staff_ids)
+                t += timedelta(minutes=30)
+        d += timedelta(days=1)
+    return slots_day, plan
+
+async def _drive(base: str, requests: int, concurrency: int, send) -> dict:
+    import httpx
+
+    latencies: List[float] = []
+    errors = 0
+    work = iter(range(requests))
+
+    async def worker(client):
+        nonlocal errors
+        for i in work:
+            started = _time.perf_counter()
+            response = await send(client, i)
+            latencies.append(_time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, timeout=120, limits=limits) as client:
+        started = _time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = _time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="จำนวน request ต่อกรณี")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    if not os.environ.get("DATABASE_URL"):
+        tmp = tempfile.mkdtemp(prefix="queue-booking-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+    os.environ["SLOT_CACHE_TTL"] = "0"
+    os.environ.setdefault("LINE_NOTIFY_TOKEN", "")
+
+    slots_day, plan = _prepare()
+    if len(plan) < 2 * (args.requests + 20):
+        sys.exit("ช่วงเวลาว่างสำหรับจองไม่พอ ลด --requests")
+    bookings = iter(plan)
+
+    def booking_body():
+        d, staff_id, start, end = next(bookings)
+        return {"customer_name": "bench", "customer_phone": "0", "date": d.isoformat(), "start_time": start.strftime("%H:%M"),
+                "end_time": end.strftime("%H:%M"), "service_id": 1, "staff_id": staff_id}
+
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen([sys.executable, "-m", "bench.load", "--serve", str(port)], env=os.environ.copy())
+    try:
+        import httpx
+        for _ in range(100):
+            try:
+                if httpx.get(base + "/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                _time.sleep(0.1)
+        else:
+            sys.exit("server ไม่ขึ้น")
+
+        params = {"d": slots_day.isoformat(), "service_id": 1}
+        cases = [
+            ("GET  slots        sync ", lambda c, i: c.get("/bench/sync/slots", params=params)),
+            ("GET  slots        async", lambda c, i: c.get("/appointments/slots", params=params)),
+            ("POST appointments sync ", lambda c, i: c.post("/bench/sync/appointments", json=booking_body())),
+            ("POST appointments async", lambda c, i: c.post("/appointments", json=booking_body())),
+        ]
+        print(f"{os.environ['DATABASE_URL'].split(':')[0]}, {args.requests} requests, concurrency {args.concurrency}")
+        for name, send in cases:
+            asyncio.run(_drive(base, 20, 5, send))  # warm up
+            r = asyncio.run(_drive(base, args.requests, args.concurrency, send))
+            print(f"  {name}  {r['rps']:8.1f} req/s  p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms  errors {r['errors']}")
+    finally:
+        server.terminate()
+        server.wait(30)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""payload benchmark: ขนาดและเวลา serialize ของ get_slots แบบเต็ม เทียบกับ compact (?format=compact)
+
+    python -m bench.payload                                 # 20 พนักงาน, step 5 นาที, 10 คิว/คน
+    python -m bench.payload --staff 50 --appointments 20 --gzip-level 6
+
+payload แบบเต็มสร้างเหมือน _compute_slots (ไม่ใช้ฐานข้อมูล) compact สร้างจาก payload เต็มที่ cache ไว้
+เวลา "สร้าง" ของ compact คือ compact_slots() ที่ทำทุก request เวลา gzip ใช้ระดับเดียวกับ GZIP_LEVEL
+"""
+import argparse
+import gzip
+import timeit
+from datetime import date
+import orjson
+from app.slots import build_day_slots, compact_slots
+from bench.slots import random_day
+
+def full_payload(d: date, service, schedules, bh, existing_by_staff) -> dict:
+    slots = build_day_slots(d, service, schedules, bh, existing_by_staff)
+    return {
+        "date": d.isoformat(),
+        "slots": slots,
+        "service": service.name,
+        "service_id": service.id,
+        "duration_minutes": service.duration_minutes,
+        "step_minutes": bh.slot_minutes,
+        "debug": {"weekday": d.weekday(), "staff_count": len(schedules), "schedule_count": len(schedules), "slots_count": len(slots)},
+    }
+
+def _ms(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--staff", type=int, default=20)
+    parser.add_argument("--appointments", type=int, default=10, help="จำนวนคิวต่อพนักงาน")
+    parser.add_argument("--step", type=int, default=5, help="slot_minutes")
+    parser.add_argument("--duration", type=int, default=15, help="ความยาวบริการ (นาที)")
+    parser.add_argument("--gzip-level", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    d = date(2030, 1, 7)
+    full = full_payload(d, *random_day(args.staff, args.appointments, args.step, args.duration))
+    cases = [
+        ("full", lambda: full),
+        ("compact (staff)", lambda: compact_slots(full, "staff")),
+        ("compact (any)", lambda: compact_slots(full, "any")),
+    ]
+
+    print(f"{args.staff} พนักงาน, step {args.step} นาที, {args.appointments} คิว/คน, {len(full['slots'])} slots")
+    print(f"  {'รูปแบบ':<16} {'JSON':>10} {'gzip':>10}   {'สร้าง':>8} {'orjson':>8} {'gzip':>8}")
+    for name, build in cases:
+        data = build()
+        body = orjson.dumps(data)
+        compressed = gzip.compress(body, args.gzip_level)
+        print(
+            f"  {name:<16} {len(body):>8,} B {len(compressed):>8,} B"
+            f"   {_ms(build, args.repeat):6.2f}ms {_ms(lambda: orjson.dumps(data), args.repeat):6.2f}ms"
+            f" {_ms(lambda: gzip.compress(body, args.gzip_level), args.repeat):6.2f}ms"
+        )
+
+if __name__ == "__main__":
+    main()
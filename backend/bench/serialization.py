@@ -0,0 +1,78 @@
+"""serialization benchmark: หน้า list_appointments แบบเดิม (ORM object → jsonable_encoder → json)
+เทียบกับปัจจุบัน (select เฉพาะคอลัมน์ → response_model AppointmentRead → orjson)
+
+    python -m bench.serialization                           # SQLite ชั่วคราว, หน้าละ 500 แถว (MAX_PAGE_SIZE)
+    python -m bench.serialization --rows 100 --repeat 50
+
+ใช้ serialize_response ของ FastAPI และ response class จริง เหมือนที่ route ทำ (ไม่รวม HTTP/routing)
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time as _time
+from datetime import date, time, timedelta
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500, help="จำนวนแถวต่อหน้า")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if not os.environ.get("DATABASE_URL"):
+        tmp = tempfile.mkdtemp(prefix="queue-booking-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import APIRoute, serialize_response
+    from sqlmodel import Session, select
+    from app import database
+    from app.cli import main as cli_main
+    from app.main import app
+    from app.models import Appointment
+    from app.routers.appointments import APPOINTMENT_COLUMNS
+
+    cli_main(["init"])
+    route = next(r for r in app.routes if isinstance(r, APIRoute) and r.path == "/appointments" and "GET" in r.methods)
+    with Session(database.engine) as session:
+        start = date(2030, 1, 7)
+        session.add_all([
+            Appointment(customer_name=f"ลูกค้า {i}", customer_phone="0812345678", date=start + timedelta(days=i // 16),
+                        start_time=time(9 + i % 16 // 2, 30 * (i % 2)), end_time=time(10 + i % 16 // 2, 30 * (i % 2)),
+                        service_id=1, staff_id=1, status="confirmed", note="bench")
+            for i in range(args.rows)
+        ])
+        session.commit()
+
+        async def before() -> bytes:
+            rows = session.exec(select(Appointment).limit(args.rows)).all()
+            session.expunge_all()  # แต่ละ request มี session ใหม่ ไม่ได้ object จาก identity map
+            return JSONResponse(await serialize_response(response_content=rows)).body
+
+        async def after() -> bytes:
+            rows = session.execute(select(*APPOINTMENT_COLUMNS).limit(args.rows)).mappings().all()
+            return ORJSONResponse(await serialize_response(field=route.response_field, response_content=rows)).body
+
+        async def best_ms(fn) -> float:
+            await fn()
+            runs = []
+            for _ in range(args.repeat):
+                started = _time.perf_counter()
+                await fn()
+                runs.append(_time.perf_counter() - started)
+            return min(runs) * 1000
+
+        async def run():
+            import orjson
+            assert orjson.loads(await before()) == orjson.loads(await after())
+            return await best_ms(before), await best_ms(after)
+
+        before_ms, after_ms = asyncio.run(run())
+    print(f"{os.environ['DATABASE_URL'].split(':')[0]}, {args.rows} แถว (query + serialize, ดีที่สุดจาก {args.repeat} รอบ)")
+    print(f"  เดิม: ORM + jsonable_encoder + json   {before_ms:7.2f} ms")
+    print(f"  ใหม่: คอลัมน์ + AppointmentRead + orjson {after_ms:7.2f} ms")
+    print(f"  เร็วขึ้น {before_ms / after_ms:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""เปรียบเทียบ build_day_slots (two-pointer) กับแบบเดิมที่เช็ค overlap() กับทุกคิวทุก slot
+
+    python -m bench.slots                                   # 20 พนักงาน, step 5 นาที, 100 คิว/คน
+    python -m bench.slots --staff 50 --appointments 200 --step 5 --duration 15
+"""
+import argparse
+import random
+import timeit
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List
+from app.models import Appointment, BusinessHours, Service, StaffSchedule
+from app.slots import build_day_slots, overlap
+
+def build_day_slots_overlap(
+    d: date,
+    service: Service,
+    schedules: List[StaffSchedule],
+    bh: BusinessHours,
+    existing_by_staff: Dict[int, List[Appointment]],
+) -> List[dict]:
+    """การสร้าง slots ก่อนใช้ two-pointer: เช็ค overlap() กับทุกคิวทุก slot (O(slots × appointments))
+
+    เก็บไว้เป็นตัวเทียบผลลัพธ์ (tests/test_slots.py) และความเร็ว
+    """
+    slots = []
+    step = timedelta(minutes=bh.slot_minutes)
+    service_duration = timedelta(minutes=service.duration_minutes)
+    for schedule in schedules:
+        start = datetime.combine(d, schedule.open_time)
+        end = datetime.combine(d, schedule.close_time)
+        existing = existing_by_staff.get(schedule.staff_id, [])
+
+        t = start
+        while t + service_duration <= end:
+            slot_start = t.time()
+            slot_end = (t + service_duration).time()
+            conflict = any(overlap(slot_start, slot_end, ap.start_time, ap.end_time) for ap in existing)
+            slots.append({
+                "start": slot_start.strftime("%H:%M"),
+                "end": slot_end.strftime("%H:%M"),
+                "available": not conflict,
+                "staff_id": schedule.staff_id,
+                "service_id": service.id,
+                "duration_minutes": service.duration_minutes
+            })
+            t += step
+    return slots
+
+def _time(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
+
+def random_day(staff: int, appointments: int, step: int, duration: int, seed: int = 0) -> tuple:
+    """อาร์กิวเมนต์ของ build_day_slots (ยกเว้นวันที่): (service, schedules, bh, existing_by_staff)
+
+    คิวสุ่มทั้งทับกัน ยาวศูนย์ และเลยเวลาเปิด/ปิดร้าน เพื่อครอบคลุมกรณีขอบ
+    """
+    rng = random.Random(seed)
+    service = Service(id=1, name="bench", duration_minutes=duration)
+    bh = BusinessHours(weekday=0, open_time=time(8), close_time=time(20), slot_minutes=step)
+    schedules = [
+        StaffSchedule(staff_id=s, weekday=0, open_time=time(8 + s % 2), close_time=time(20 - s % 3))
+        for s in range(1, staff + 1)
+    ]
+    existing_by_staff = {}
+    for sc in schedules:
+        rows = []
+        for _ in range(appointments):
+            start = rng.randrange(7 * 60, 21 * 60)
+            end = min(start + rng.choice((0, 5, 10, 15, 30, 45, 60, 90)), 23 * 60 + 59)
+            rows.append(Appointment(staff_id=sc.staff_id, start_time=_time(start), end_time=_time(end)))
+        existing_by_staff[sc.staff_id] = rows
+    return service, schedules, bh, existing_by_staff
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--staff", type=int, default=20)
+    parser.add_argument("--appointments", type=int, default=100, help="จำนวนคิวต่อพนักงาน")
+    parser.add_argument("--step", type=int, default=5, help="slot_minutes")
+    parser.add_argument("--duration", type=int, default=15, help="ความยาวบริการ (นาที)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    d = date(2030, 1, 7)
+    day = random_day(args.staff, args.appointments, args.step, args.duration)
+    expected = build_day_slots_overlap(d, *day)
+    assert build_day_slots(d, *day) == expected, "ผลลัพธ์ไม่ตรงกับแบบเดิม"
+
+    print(f"{args.staff} staff × {args.appointments} appointments, step {args.step} min -> {len(expected)} slots")
+    results = {}
+    for name, fn in (("overlap scan", build_day_slots_overlap), ("two-pointer", build_day_slots)):
+        best = min(timeit.repeat(lambda: fn(d, *day), number=1, repeat=args.repeat))
+        results[name] = best
+        print(f"  {name:<13} {best * 1000:9.2f} ms")
+    print(f"  speedup       {results['overlap scan'] / results['two-pointer']:9.1f}x")
+
+if __name__ == "__main__":
+    main()
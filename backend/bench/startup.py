@@ -0,0 +1,66 @@
+"""cold start benchmark: เวลาตั้งแต่เริ่ม run_backend.py จน /health ตอบ 200 บนฐานข้อมูลที่ init แล้ว
+
+    python -m bench.startup               # SQLite ชั่วคราว
+    python -m bench.startup --repeat 10
+
+เทียบ `--init` (migrate + seed ทุกครั้งที่เริ่ม แบบเดิม) กับค่าเริ่มต้น (ตรวจ schema อย่างเดียว)
+ใช้ --prod --workers 1 เหมือน bundle/Docker แต่ไม่แตก worker หลายตัวให้เวลาปนกัน
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.load import _free_port
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def cold_start(extra_args) -> float:
+    import httpx
+
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "run_backend.py", "--prod", "--workers", "1", "--port", str(port), *extra_args],
+        cwd=BACKEND_DIR, env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                sys.exit(f"server จบก่อนตอบ /health (exit {server.returncode})")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait(30)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if not os.environ.get("DATABASE_URL"):
+        tmp = tempfile.mkdtemp(prefix="queue-booking-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+    subprocess.run([sys.executable, "-m", "app.cli", "init"], cwd=BACKEND_DIR, env=os.environ.copy(),
+                   stdout=subprocess.DEVNULL, check=True)
+
+    print(f"{os.environ['DATABASE_URL'].split(':')[0]}, {args.repeat} รอบ")
+    results = {}
+    for name, extra in (("--init (migrate + seed ทุกครั้ง)", ["--init"]), ("ค่าเริ่มต้น (ตรวจ schema)", [])):
+        cold_start(extra)  # warm up (.pyc, page cache)
+        runs = [cold_start(extra) for _ in range(args.repeat)]
+        results[name] = statistics.median(runs)
+        print(f"  {name:<32} median {results[name] * 1000:7.0f} ms  min {min(runs) * 1000:7.0f} ms")
+    before, after = results.values()
+    print(f"  เร็วขึ้น {before / after:.2f}x")
+
+if __name__ == "__main__":
+    main()
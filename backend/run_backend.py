@@ -1,33 +1,119 @@
 #!/usr/bin/env python3
 """
 Script สำหรับ run FastAPI backend
-Usage: python run_backend.py
+Usage:
+    python run_backend.py                  # โหมดพัฒนา: process เดียว + auto-reload
+    python run_backend.py --prod           # โหมด production: ไม่มี reload, หลาย worker เมื่อตั้ง PUBSUB_URL
+    python run_backend.py --prod --workers 4
+
+เลือกโหมดด้วย env ได้เช่นกัน: APP_ENV=production (bundle ของ PyInstaller เป็น production เสมอ)
 """
 
-import uvicorn
+import argparse
+import importlib.util
+import multiprocessing
 import os
+import sys
+import uvicorn
 from dotenv import load_dotenv
 
 # Load environment variables จาก .env file
 load_dotenv()
 
-if __name__ == "__main__":
-    # ตั้งค่า host และ port
-    host = os.getenv("HOST", "0.0.0.0")
-    port = int(os.getenv("PORT", 8000))
-    
-    print(f"🚀 Starting FastAPI backend...")
-    print(f"📍 Host: {host}")
-    print(f"🔌 Port: {port}")
-    print(f"📖 API Docs: http://{host}:{port}/docs")
-    print(f"🔍 Health Check: http://{host}:{port}/health")
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def default_workers() -> int:
+    """หลาย worker ต้องมี PUBSUB_URL ไม่เช่นนั้น SSE ไม่ข้าม worker จึงเริ่มที่ 1 (เพิ่มเองด้วย --workers/WEB_WORKERS)"""
+    return (os.cpu_count() or 1) if os.getenv("PUBSUB_URL") else 1
+
+def parse_args(argv=None):
+    frozen = getattr(sys, "frozen", False)
+    default_prod = frozen or os.getenv("APP_ENV", "development").lower() in ("prod", "production")
+    parser = argparse.ArgumentParser(description="Run Queue Booking backend")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--prod", dest="prod", action="store_true", default=default_prod, help="production mode (no reload, multi-worker)")
+    mode.add_argument("--dev", dest="prod", action="store_false", help="development mode (single process, auto-reload)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_WORKERS", 0)) or default_workers(),
+                        help="จำนวน worker ในโหมด production (ค่าเริ่มต้น = จำนวน CPU ถ้าตั้ง PUBSUB_URL ไม่เช่นนั้น 1)")
+    parser.add_argument("--keep-alive", type=int, default=int(os.getenv("KEEP_ALIVE", 15)),
+                        help="วินาทีที่เก็บ keep-alive connection ไว้ระหว่าง request")
+    parser.add_argument("--backlog", type=int, default=int(os.getenv("BACKLOG", 2048)))
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", 30)),
+                        help="วินาทีที่รอ request ที่ค้างอยู่ก่อนปิด worker")
+    init = parser.add_mutually_exclusive_group()
+    init.add_argument("--skip-init", action="store_true", help="ไม่ตรวจ/ไม่ migrate/seed ก่อนเริ่ม server")
+    init.add_argument("--init", dest="force_init", action="store_true", help="migrate + seed ก่อนเริ่มเสมอ แม้ schema ล่าสุดแล้ว")
+    return parser.parse_args(argv)
+
+def prepare_database(force: bool = False) -> bool:
+    """migrate + seed เฉพาะเมื่อ schema ยังไม่ล่าสุด (ครั้งแรก/หลังอัปเดตเวอร์ชัน) คืน True ถ้ารัน init
+    schema พร้อมแล้วจะไม่ import alembic และไม่ seed ซ้ำทุกครั้งที่รีสตาร์ต"""
+    from app.migrate import check_schema
+    if not force:
+        try:
+            check_schema()
+            return False
+        except Exception:
+            pass
+    from app.cli import init
+    init()
+    return True
+
+def main(argv=None):
+    args = parse_args(argv)
+    # uvloop/httptools มากับ uvicorn[standard] (uvloop ไม่มีบน Windows) ถ้าไม่มีใช้ asyncio/h11 แทน
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    workers = max(args.workers, 1) if args.prod else 1
+
+    print(f"🚀 Starting FastAPI backend ({'production' if args.prod else 'development'})...")
+    print(f"📍 Host: {args.host}")
+    print(f"🔌 Port: {args.port}")
+    if args.prod:
+        print(f"👷 Workers: {workers} (loop={loop}, http={http})")
+        if workers > 1 and not os.getenv("PUBSUB_URL"):
+            # InProcessBroker: client ที่ต่อกับ worker หนึ่งจะไม่ได้ข่าวการจองที่เกิดใน worker อื่น
+            print("⚠️  PUBSUB_URL ไม่ได้ตั้งค่า: การแจ้งเตือนแบบ real-time (SSE) จะไม่ข้าม worker "
+                  "ตั้ง PUBSUB_URL=redis://... หรือใช้ --workers 1")
+    print(f"📖 API Docs: http://{args.host}:{args.port}/docs")
+    print(f"🔍 Health Check: http://{args.host}:{args.port}/health")
     print("=" * 50)
-    
-    # Run FastAPI app
+
+    # เตรียมฐานข้อมูลครั้งเดียวก่อนเริ่ม server (รันซ้ำได้ ไม่เพิ่มข้อมูลซ้ำ)
+    if not args.skip_init:
+        prepare_database(force=args.force_init)
+
+    if not args.prod:
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,  # Auto-reload เมื่อแก้ไขโค้ด
+            ws="none",  # ไม่มี websocket endpoint ไม่ต้องโหลด websockets
+            log_level="info"
+        )
+        return
+
     uvicorn.run(
         "app.main:app",
-        host=host,
-        port=port,
-        reload=True,  # Auto-reload เมื่อแก้ไขโค้ด
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        ws="none",
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        # SIGTERM/Ctrl+C: หยุดรับ connection ใหม่แล้วรอ request ที่ค้างอยู่ไม่เกินเวลานี้
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
         log_level="info"
     )
+
+if __name__ == "__main__":
+    # จำเป็นสำหรับ bundle ของ PyInstaller: worker ถูก spawn เป็น process ใหม่จาก exe เดียวกัน
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,82 @@
+"""ตั้งค่าการทดสอบ
+
+ค่าเริ่มต้นใช้ SQLite ไฟล์ชั่วคราว ถ้าต้องการทดสอบกับ MySQL จริง (ล็อกแถว, EXPLAIN) ให้ตั้ง
+TEST_DATABASE_URL และ TEST_ASYNC_DATABASE_URL เป็นฐานข้อมูลว่างสำหรับทดสอบเท่านั้น
+"""
+import os
+import tempfile
+from datetime import date, time, timedelta
+
+_tmp = tempfile.mkdtemp(prefix="queue-booking-test-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{_tmp}/test.db"
+os.environ["ASYNC_DATABASE_URL"] = os.environ.get("TEST_ASYNC_DATABASE_URL") or f"sqlite+aiosqlite:///{_tmp}/test.db"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlmodel import Session
+from app import database, reference
+from app.cli import main as cli_main
+from app.models import Staff, StaffSchedule, StaffService
+from app.slots import slot_cache
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    assert cli_main(["init"]) in (0, None)
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    reference.cache.clear()
+    slot_cache.bump_all()
+    yield
+
+@pytest.fixture
+def session():
+    with Session(database.engine) as session:
+        yield session
+
+@pytest.fixture(scope="session")
+def client():
+    # เริ่ม/ปิดแอปครั้งเดียว (ตอนปิด notifier รอ thread ได้ถึง 5 วินาที)
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+def working_day(weeks_ahead: int = 1) -> date:
+    """วันจันทร์ในอนาคต (ข้อมูลเริ่มต้นเปิดร้านและพนักงานทำงานจันทร์-เสาร์)"""
+    today = date.today()
+    return today + timedelta(days=7 * weeks_ahead - today.weekday())
+
+def add_staff(session: Session, count: int, service_id: int = 1) -> list:
+    """เพิ่มพนักงานที่ทำบริการนี้ได้และทำงาน 09:00-17:00 ทุกวัน คืนรายการ staff_id"""
+    staff = [Staff(name=f"test staff {i}") for i in range(count)]
+    session.add_all(staff)
+    session.flush()
+    for s in staff:
+        session.add(StaffService(staff_id=s.id, service_id=service_id))
+        session.add_all([
+            StaffSchedule(staff_id=s.id, weekday=wd, open_time=time(9), close_time=time(17)) for wd in range(7)
+        ])
+    ids = [s.id for s in staff]
+    # อ่าน id ก่อน commit: หลัง commit การอ่าน attribute จะเปิด transaction ใหม่ค้างไว้ใน session ของการทดสอบ
+    session.commit()
+    reference.cache.clear()
+    return ids
+
+@contextmanager
+def count_statements(engine=None):
+    """เก็บ SQL (statement, parameters) ที่ส่งไปยังฐานข้อมูลภายใน block"""
+    target = engine or database.engine
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(target, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(target, "before_cursor_execute", _record)
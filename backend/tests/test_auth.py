@@ -0,0 +1,52 @@
+import time
+import uuid
+import pytest
+from app.models import User
+from app.security import create_access_token, get_password_hash, invalidate_user_tokens
+
+def _next_second():
+    # iat เป็นวินาทีเต็ม: token ที่ออกในวินาทีเดียวกับการ revoke ยังใช้ได้
+    time.sleep(1.01 - time.time() % 1)
+
+def _bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def admin(session):
+    user = User(name="test admin", phone="0", email=f"{uuid.uuid4().hex}@example.com", role="admin",
+                password_hash=get_password_hash("secret"))
+    session.add(user)
+    session.commit()
+    return user.id, user.email
+
+def test_revoked_token_is_rejected(client, admin):
+    admin_id, _ = admin
+    old = create_access_token(str(admin_id), role="admin")
+    assert client.get("/metrics/cache", headers=_bearer(old)).status_code == 200  # อยู่ใน cache แล้ว
+    ticket = client.post("/appointments/stream/ticket", headers=_bearer(old)).json()["ticket"]
+
+    _next_second()
+    invalidate_user_tokens(admin_id)
+
+    assert client.get("/metrics/cache", headers=_bearer(old)).status_code == 401
+    assert client.get("/appointments/stream", params={"ticket": ticket}).status_code == 401
+    new = create_access_token(str(admin_id), role="admin")
+    assert client.get("/metrics/cache", headers=_bearer(new)).status_code == 200
+
+def test_login_rehash_revokes_old_tokens_but_not_the_new_one(client, session, admin):
+    admin_id, email = admin
+    # hash ด้วย cost ต่างจาก BCRYPT_ROUNDS ของการทดสอบ login จึง hash ใหม่และ revoke token เดิม
+    from passlib.context import CryptContext
+    user = session.get(User, admin_id)
+    user.password_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("secret")
+    session.commit()
+    old = create_access_token(str(admin_id), role="admin")
+    _next_second()
+
+    response = client.post("/auth/login", data={"username": email, "password": "secret"})
+    assert response.status_code == 200
+    session.refresh(user)
+    assert "$05$" not in user.password_hash
+
+    assert client.get("/metrics/cache", headers=_bearer(old)).status_code == 401
+    assert client.get("/metrics/cache", headers=_bearer(response.json()["access_token"])).status_code == 200
@@ -0,0 +1,62 @@
+import threading
+from datetime import time
+from fastapi import HTTPException
+from sqlmodel import Session, select
+from app import database
+from app.models import Appointment
+from app.routers.appointments import _book
+from conftest import add_staff, working_day
+
+THREADS = 8
+
+def _race(staff_id, d, intervals):
+    """จองพร้อมกันหลาย thread (คนละ session) คืนรายการผลลัพธ์: "ok" หรือข้อความ error"""
+    barrier = threading.Barrier(len(intervals))
+    results = []
+    lock = threading.Lock()
+
+    def worker(i, start, end):
+        with Session(database.engine) as session:
+            ap = Appointment(customer_name=f"c{i}", customer_phone="0", date=d, start_time=start, end_time=end,
+                             service_id=1, staff_id=staff_id)
+            barrier.wait()
+            try:
+                _book(session, ap)
+                session.commit()
+                result = "ok"
+            except HTTPException as e:
+                session.rollback()
+                result = e.detail
+            except Exception as e:  # deadlock, lock wait timeout, duplicate key ...
+                session.rollback()
+                result = f"{type(e).__name__}: {e}"
+        with lock:
+            results.append(result)
+
+    threads = [threading.Thread(target=worker, args=(i, s, e)) for i, (s, e) in enumerate(intervals)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+    return results
+
+def test_concurrent_bookings_for_one_slot_only_one_succeeds(session):
+    # พนักงานใหม่ = ยังไม่มีแถวล็อกของวันนั้น ทุก thread แข่งกันสร้างแถวแรก
+    staff_id = add_staff(session, 1)[0]
+    d = working_day(3)
+    results = _race(staff_id, d, [(time(10), time(10, 30))] * THREADS)
+
+    assert results.count("ok") == 1, results
+    assert results.count("Time slot already booked") == THREADS - 1, results
+    booked = session.exec(select(Appointment).where(Appointment.staff_id == staff_id, Appointment.date == d)).all()
+    assert len(booked) == 1
+
+def test_concurrent_overlapping_bookings_only_one_succeeds(session):
+    staff_id = add_staff(session, 1)[0]
+    d = working_day(3)
+    # ช่วงเวลาต่างกันแต่ทับกันทั้งหมด (unique constraint ช่วยไม่ได้ ต้องพึ่งล็อก)
+    intervals = [(time(11, 5 * i), time(11, 30 + 5 * i)) for i in range(6)]
+    results = _race(staff_id, d, intervals)
+
+    assert results.count("ok") == 1, results
+    assert results.count("Time slot already booked") == len(intervals) - 1, results
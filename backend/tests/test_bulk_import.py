@@ -0,0 +1,14 @@
+import pytest
+from app.bulk_import import _parse_row
+from app.models import APPOINTMENT_STATUSES
+
+ROW = {"customer_name": "c", "customer_phone": "0", "date": "2030-01-07", "start_time": "09:00",
+       "service_id": "1", "staff_id": "1"}
+
+@pytest.mark.parametrize("status", APPOINTMENT_STATUSES)
+def test_import_accepts_every_model_status(status):
+    assert _parse_row({**ROW, "status": status})["status"] == status
+
+def test_import_rejects_unknown_status():
+    with pytest.raises(ValueError):
+        _parse_row({**ROW, "status": "done"})
@@ -0,0 +1,48 @@
+import time
+from datetime import date, timedelta
+from app.cache import SlotCache, TTLCache
+
+def test_load_started_before_invalidate_is_not_cached():
+    cache = TTLCache(ttl=60)
+
+    def stale_loader():
+        # มีการแก้ข้อมูล (และ invalidate) ระหว่างที่กำลังโหลดค่าเก่าอยู่
+        cache.invalidate("services")
+        return "old"
+
+    assert cache.get_or_load(("services",), stale_loader) == "old"
+    assert cache.get_or_load(("services",), lambda: "new") == "new"
+    assert cache.get_or_load(("services",), lambda: "unused") == "new"
+
+def test_slot_etag_depends_only_on_payload():
+    d = date(2030, 1, 7)
+    worker_a, worker_b = SlotCache(ttl=60), SlotCache(ttl=60)
+    worker_b.bump_date(d)
+    payload = {"date": d.isoformat(), "slots": [{"start": "09:00", "available": True}]}
+
+    etag = worker_a.put(d, 1, worker_a.version(d), payload)
+    assert worker_b.put(d, 1, worker_b.version(d), dict(reversed(payload.items()))) == etag
+    assert worker_a.put(d, 1, worker_a.version(d), {**payload, "slots": []}) != etag
+
+def test_slot_cache_is_bounded_lru():
+    cache = SlotCache(ttl=60, maxsize=2)
+    d = date.today()
+    for service_id in (1, 2):
+        cache.put(d, service_id, cache.version(d), {"service_id": service_id})
+    assert cache.get(d, 1)  # 1 ถูกใช้ล่าสุด 2 จึงถูกทิ้งก่อน
+    cache.put(d, 3, cache.version(d), {"service_id": 3})
+
+    assert cache.get(d, 2) is None
+    assert cache.get(d, 1) and cache.get(d, 3)
+    assert cache.stats()["entries"] == 2
+
+def test_slot_cache_drops_expired_entries_and_past_dates():
+    cache = SlotCache(ttl=0.01, maxsize=10)
+    d = date.today()
+    cache.put(d, 1, cache.version(d), {})
+    time.sleep(0.02)
+    cache.put(d, 2, cache.version(d), {})
+    assert cache.stats()["entries"] == 1
+
+    cache.bump_date(d - timedelta(days=1), d)
+    assert cache.stats()["tracked_dates"] == 1
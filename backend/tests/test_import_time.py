@@ -0,0 +1,42 @@
+"""เวลา import ตอนเริ่มแอป (python -X importtime ใน process ใหม่ ไม่ปนกับ module ที่ pytest โหลดไว้แล้ว)
+
+ตั้ง IMPORT_TIME_BUDGET_MS เพื่อปรับเพดานบนเครื่องที่ช้า
+"""
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 3000))
+# ใช้เฉพาะตอน migrate / login (import ตอนเรียกใช้จริง) ห้ามโหลดตอนเริ่ม worker
+HEAVY = ("alembic", "passlib", "jose")
+
+def importtime(code: str):
+    """รัน code แล้วคืน {module: cumulative µs} ของทุก module ที่ถูก import ระหว่างรัน"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, env=os.environ.copy(), capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(cumulative), len(name) - len(name.lstrip()))
+    return result.stdout, modules
+
+def _heavy(modules) -> list:
+    return sorted(m for m in modules if m.split(".")[0] in HEAVY)
+
+def test_import_app_main_is_light():
+    _, modules = importtime("import app.main")
+    assert _heavy(modules) == []
+    # module ระดับบนสุด (indent 1 ช่อง) ของแพ็กเกจ app รวมทุกอย่างที่ app.main ดึงเข้ามา
+    total_ms = sum(us for name, (us, indent) in modules.items() if indent == 1 and name.split(".")[0] == "app") / 1000
+    assert total_ms < BUDGET_MS, f"import app.main ใช้ {total_ms:.0f} ms (เพดาน {BUDGET_MS:.0f} ms)"
+
+def test_startup_with_current_schema_does_not_migrate():
+    # เส้นทางของ bundle/Docker: run_backend.py → prepare_database() บนฐานข้อมูลที่ init แล้ว (fixture schema)
+    stdout, modules = importtime("import run_backend; print(run_backend.prepare_database())")
+    assert stdout.strip() == "False"
+    assert _heavy(modules) == []
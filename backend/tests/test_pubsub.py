@@ -0,0 +1,32 @@
+import threading
+import time
+import pytest
+from app.pubsub import RedisBroker
+
+class SlowRedis:
+    """แทน redis.Redis ที่ publish ค้างจนกว่าจะปล่อย (เช่น Redis ช้าหรือเครือข่ายหลุด)"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.sent = []
+
+    def publish(self, channel, data):
+        self.release.wait(5)
+        self.sent.append(channel)
+
+def test_redis_publish_does_not_block_the_caller():
+    pytest.importorskip("redis")
+    broker = RedisBroker("redis://localhost:6379/0")
+    broker._redis = SlowRedis()
+
+    started = time.perf_counter()
+    broker.publish("admin", {"type": "created"})
+    broker.publish("slots:2030-01-01", {"type": "booked"})
+    assert time.perf_counter() - started < 0.5
+
+    broker._redis.release.set()
+    deadline = time.monotonic() + 5
+    while len(broker._redis.sent) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert broker._redis.sent == [RedisBroker.PREFIX + "admin", RedisBroker.PREFIX + "slots:2030-01-01"]
+    assert broker.stats()["dropped"] == 0
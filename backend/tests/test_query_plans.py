@@ -0,0 +1,85 @@
+"""query หลักของคิวต้องใช้ index ไม่ scan ทั้งตาราง appointment
+
+ตรวจด้วย EXPLAIN QUERY PLAN (SQLite) หรือ EXPLAIN (MySQL) ของ SQL ที่โค้ดจริงส่งไป
+"""
+from datetime import date, time, timedelta
+import pytest
+from sqlalchemy import delete, insert, select, text
+from sqlmodel import Session
+from app import database
+from app.booking import has_conflict
+from app.models import Appointment
+from app.routers.appointments import APPOINTMENT_COLUMNS, _compute_slots, _filtered_appointments
+from conftest import add_staff, count_statements, working_day
+
+START = date(2020, 1, 6)
+DAYS = 120
+
+@pytest.fixture(scope="module")
+def staff_id():
+    """คิวหลายร้อยแถวกระจายหลายวัน/สถานะ ให้ตัววางแผนของ MySQL เลือก index เหมือนข้อมูลจริง"""
+    with Session(database.engine) as session:
+        sid = add_staff(session, 1)[0]
+        session.execute(insert(Appointment), [
+            {"customer_name": "plan", "customer_phone": "0", "date": START + timedelta(days=day),
+             "start_time": time(9 + slot), "end_time": time(10 + slot), "service_id": 1, "staff_id": sid,
+             "status": ("pending", "confirmed", "completed", "canceled")[(day + slot) % 4]}
+            for day in range(DAYS) for slot in range(6)
+        ])
+        session.commit()
+        if database.engine.dialect.name == "mysql":
+            session.execute(text("ANALYZE TABLE appointment"))
+    yield sid
+    with Session(database.engine) as session:
+        session.execute(delete(Appointment).where(Appointment.staff_id == sid))
+        session.commit()
+
+def _appointment_scans(session, statements) -> list:
+    """แผนของ statement ที่อ่านตาราง appointment แบบ full scan"""
+    conn = session.connection()
+    scans = []
+    for statement, parameters in statements:
+        if "appointment" not in statement:
+            continue
+        if conn.dialect.name == "sqlite":
+            plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).mappings().all()
+            scans += [
+                row["detail"] for row in plan
+                if row["detail"].startswith("SCAN appointment") and "INDEX" not in row["detail"]
+            ]
+        elif conn.dialect.name == "mysql":
+            plan = conn.exec_driver_sql("EXPLAIN " + statement, parameters).mappings().all()
+            scans += [dict(row) for row in plan if row["table"] == "appointment" and row["type"] == "ALL"]
+        else:
+            pytest.skip(f"no EXPLAIN check for {conn.dialect.name}")
+        if scans:
+            scans.append(statement)
+    return scans
+
+def _run_and_explain(session, run) -> list:
+    with count_statements() as statements:
+        run()
+    assert any("appointment" in s for s, _ in statements)
+    return _appointment_scans(session, statements)
+
+def test_conflict_check_uses_staff_date_index(session, staff_id):
+    d = START + timedelta(days=10)
+    assert not _run_and_explain(session, lambda: has_conflict(session, staff_id, d, time(8), time(8, 30)))
+
+def test_slot_computation_uses_index(session, staff_id):
+    assert not _run_and_explain(session, lambda: _compute_slots(session, working_day(), 1))
+
+@pytest.mark.parametrize("date_from, date_to, status", [
+    (None, None, None),
+    (START + timedelta(days=30), None, None),
+    (START + timedelta(days=30), START + timedelta(days=37), "confirmed"),
+])
+def test_admin_list_uses_index(session, staff_id, date_from, date_to, status):
+    stmt = _filtered_appointments(select(*APPOINTMENT_COLUMNS), date_from, date_to, status).limit(101)
+    assert not _run_and_explain(session, lambda: session.execute(stmt).all())
+
+def test_export_filter_uses_index(session, staff_id):
+    stmt = _filtered_appointments(
+        select(Appointment.__table__), START + timedelta(days=30), START + timedelta(days=60), "confirmed"
+    )
+    assert not _run_and_explain(session, lambda: session.execute(stmt).all())
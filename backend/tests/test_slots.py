@@ -0,0 +1,75 @@
+import random
+from datetime import date, time
+import pytest
+from app import reference
+from app.models import Appointment
+from app.routers.appointments import _compute_slots
+from app.slots import build_day_slots, slot_cache
+from bench.slots import build_day_slots_overlap, random_day
+from conftest import add_staff, count_statements, working_day
+
+def _slot_queries(session, d) -> int:
+    reference.cache.clear()
+    with count_statements() as statements:
+        payload = _compute_slots(session, d, 1)
+    assert payload["slots"]
+    return len(statements)
+
+def test_compute_slots_query_count_does_not_grow_with_staff(session):
+    d = working_day()
+    baseline = _slot_queries(session, d)
+
+    staff_ids = add_staff(session, 10)
+    session.add_all([
+        Appointment(customer_name="c", customer_phone="0", date=d, start_time=time(10), end_time=time(10, 30),
+                    service_id=1, staff_id=staff_id)
+        for staff_id in staff_ids
+    ])
+    session.commit()
+
+    assert _slot_queries(session, d) == baseline
+
+def test_compute_slots_marks_booked_time_unavailable(session):
+    d = working_day(2)
+    staff_id = add_staff(session, 1)[0]
+    session.add(Appointment(customer_name="c", customer_phone="0", date=d, start_time=time(9), end_time=time(9, 30),
+                            service_id=1, staff_id=staff_id))
+    session.commit()
+    slots = {(s["staff_id"], s["start"]): s["available"] for s in _compute_slots(session, d, 1)["slots"]}
+    assert slots[(staff_id, "09:00")] is False
+    assert slots[(staff_id, "09:30")] is True
+
+@pytest.mark.parametrize("seed", range(50))
+def test_build_day_slots_matches_overlap_reference(seed):
+    rng = random.Random(seed)
+    day = random_day(
+        staff=rng.randint(1, 4), appointments=rng.randint(0, 40),
+        step=rng.choice((5, 10, 15, 30)), duration=rng.choice((5, 15, 30, 45, 60)), seed=seed,
+    )
+    d = date(2030, 1, 7)
+    assert build_day_slots(d, *day) == build_day_slots_overlap(d, *day)
+
+def test_slots_etag_follows_data_not_process(session, client):
+    d = working_day(4)
+    staff_id = add_staff(session, 1)[0]
+    params = {"d": d.isoformat(), "service_id": 1}
+    etag = client.get("/appointments/slots", params=params).headers["etag"]
+
+    # cache หมดอายุ/อยู่คนละ worker แต่ข้อมูลเหมือนเดิม: ETag เดิมยังได้ 304
+    slot_cache.bump_all()
+    assert client.get("/appointments/slots", params=params, headers={"If-None-Match": etag}).status_code == 304
+
+    # worker อื่นรับการจอง (process นี้ไม่ได้ล้าง cache) หลัง cache หมดอายุต้องได้ข้อมูลและ ETag ใหม่
+    session.add(Appointment(customer_name="c", customer_phone="0", date=d, start_time=time(9), end_time=time(9, 30),
+                            service_id=1, staff_id=staff_id))
+    session.commit()
+    slot_cache.bump_all()
+    changed = client.get("/appointments/slots", params=params, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+def test_unknown_service_is_a_client_error(client):
+    params = {"d": working_day().isoformat(), "service_id": 999999}
+    response = client.get("/appointments/slots", params=params)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Service not found"
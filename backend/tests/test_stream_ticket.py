@@ -0,0 +1,29 @@
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+from app.deps import require_admin_ticket
+from app.models import User
+from app.security import create_access_token, verify_access_token
+
+@pytest.fixture
+def admin_headers(session):
+    admin_id = session.exec(select(User.id).where(User.role == "admin")).first()
+    return {"Authorization": f"Bearer {create_access_token(str(admin_id), role='admin')}"}
+
+def test_ticket_requires_admin(client):
+    assert client.post("/appointments/stream/ticket").status_code == 401
+
+def test_ticket_is_single_use(client, admin_headers):
+    ticket = client.post("/appointments/stream/ticket", headers=admin_headers).json()["ticket"]
+
+    assert require_admin_ticket(ticket)["role"] == "admin"
+    with pytest.raises(HTTPException) as exc:
+        require_admin_ticket(ticket)
+    assert exc.value.status_code == 401
+
+def test_ticket_is_not_an_access_token(client, admin_headers):
+    ticket = client.post("/appointments/stream/ticket", headers=admin_headers).json()["ticket"]
+
+    assert verify_access_token(ticket) is None
+    assert client.get("/appointments", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+    assert client.get("/appointments/stream", params={"token": admin_headers["Authorization"][7:]}).status_code == 422
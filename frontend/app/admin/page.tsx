@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import axios from "axios";
 
 const API = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
@@ -23,6 +23,7 @@ export default function Admin() {
   const [dateFrom, setDateFrom] = useState("");
   const [dateTo, setDateTo] = useState("");
   const [appointments, setAppointments] = useState<Appointment[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [msg, setMsg] = useState("");
   const [activeTab, setActiveTab] = useState<"appointments" | "business-hours" | "holidays" | "services" | "staff">("appointments");
   const [businessHours, setBusinessHours] = useState<any[]>([]);
@@ -91,22 +92,79 @@ export default function Admin() {
     }
   };
 
-  const load = async () => {
+  // cursor = null คือโหลดหน้าแรกใหม่, มีค่า = โหลดหน้าถัดไปต่อท้าย
+  const load = async (cursor: string | null = null) => {
     // ตรวจสอบ token ก่อนเรียก API
     const currentToken = token || localStorage.getItem("jwt");
     if (!currentToken) return;
     
     try {
       const res = await axios.get(`${API}/appointments`, {
-        params: { date_from: dateFrom || undefined, date_to: dateTo || undefined },
+        params: { date_from: dateFrom || undefined, date_to: dateTo || undefined, cursor: cursor || undefined },
         headers: { Authorization: `Bearer ${currentToken}` },
       });
-      setAppointments(res.data || []);
+      const page: Appointment[] = res.data || [];
+      setAppointments(prev => cursor ? [...prev, ...page] : page);
+      setNextCursor(res.headers["x-next-cursor"] || null);
     } catch (e: any) {
       setMsg(e?.response?.data?.detail || "โหลดรายการไม่สำเร็จ");
     }
   };
 
+  // รับการเปลี่ยนแปลงของคิวแบบ real-time (SSE): คิวใหม่/นำเข้า → โหลดหน้าแรกใหม่, ยืนยัน/ยกเลิก → แก้สถานะในรายการ
+  const loadRef = useRef(load);
+  loadRef.current = load;
+  useEffect(() => {
+    if (!token) return;
+    let es: EventSource | null = null;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let closed = false;
+    let connected = false;
+    const reload = () => loadRef.current();
+    const updateStatus = (e: MessageEvent) => {
+      const ap = JSON.parse(e.data).appointment;
+      setAppointments(prev => prev.map(a => a.id === ap.id ? { ...a, status: ap.status } : a));
+    };
+    // JWT ไม่ใส่ใน URL (ถูกเก็บใน access log): ขอ ticket ใช้ครั้งเดียวก่อนเปิด stream ทุกครั้ง
+    // ticket ใช้ซ้ำไม่ได้ จึงปิด EventSource เมื่อหลุดแล้วเชื่อมต่อใหม่ด้วย ticket ใหม่แทนการ retry เอง
+    const connect = async () => {
+      let ticket: string;
+      try {
+        const res = await axios.post(`${API}/appointments/stream/ticket`, {}, {
+          headers: { Authorization: `Bearer ${token}` },
+        });
+        ticket = res.data.ticket;
+      } catch (e: any) {
+        // 401/403 = token หมดอายุหรือไม่ใช่แอดมิน ไม่ต้องลองใหม่
+        if (!closed && ![401, 403].includes(e?.response?.status)) retry = setTimeout(connect, 5000);
+        return;
+      }
+      if (closed) return;
+      const source = new EventSource(`${API}/appointments/stream?ticket=${encodeURIComponent(ticket)}`);
+      es = source;
+      source.onopen = () => {
+        // เชื่อมต่อใหม่หลังหลุด: อาจพลาดข่าวระหว่างนั้น โหลดรายการใหม่
+        if (connected) reload();
+        connected = true;
+      };
+      source.onerror = () => {
+        source.close();
+        if (!closed) retry = setTimeout(connect, 3000);
+      };
+      source.addEventListener("created", reload);
+      source.addEventListener("imported", reload);
+      source.addEventListener("resync", reload);
+      source.addEventListener("confirmed", updateStatus as EventListener);
+      source.addEventListener("canceled", updateStatus as EventListener);
+    };
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      es?.close();
+    };
+  }, [token]);
+
   const act = async (id: number, action: "confirm" | "cancel") => {
     try {
       await axios.post(`${API}/appointments/${id}/${action}`, {}, { headers: authHeader() });
@@ -121,6 +179,7 @@ export default function Admin() {
     setToken(null);
     localStorage.removeItem("jwt");
     setAppointments([]);
+    setNextCursor(null);
     setDateFrom("");
     setDateTo("");
     setMsg("ออกจากระบบสำเร็จ");
@@ -433,7 +492,7 @@ export default function Admin() {
                 <div className="grid grid-cols-1 md:grid-cols-3 gap-3">
                   <input className="input" type="date" value={dateFrom} onChange={e => setDateFrom(e.target.value)} />
                   <input className="input" type="date" value={dateTo} onChange={e => setDateTo(e.target.value)} />
-                  <button className="btn border" onClick={load}>โหลดรายการ</button>
+                  <button className="btn border" onClick={() => load()}>โหลดรายการ</button>
                 </div>
               </div>
 
@@ -468,6 +527,9 @@ export default function Admin() {
                     </tbody>
                   </table>
                 </div>
+                {nextCursor && (
+                  <button className="btn border mt-4" onClick={() => load(nextCursor)}>โหลดเพิ่ม</button>
+                )}
               </div>
             </>
           )}
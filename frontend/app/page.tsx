@@ -1,11 +1,14 @@
 "use client";
 
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useMemo, useRef, useState } from "react";
 import axios from "axios";
 
 const API = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
 type Slot = { start: string; end: string; available: boolean; staff_id?: number; service_id?: number; duration_minutes?: number };
+type Hold = { token: string; start: string; staff_id: number };
+
+const isHeld = (s: Slot, h: Hold | null) => !!h && h.start === s.start && h.staff_id === s.staff_id;
 
 export default function Home() {
   const [services, setServices] = useState<any[]>([]);
@@ -19,6 +22,8 @@ export default function Home() {
   const [message, setMessage] = useState("");
   const [showSuccessModal, setShowSuccessModal] = useState(false);
   const [bookingDetails, setBookingDetails] = useState<any>(null);
+  // ช่วงเวลาที่กันไว้ระหว่างกรอกข้อมูล (ref เพราะ loadSlots ถูกเรียกจาก EventSource)
+  const holdRef = useRef<Hold | null>(null);
 
   // โหลดรายการบริการ
   useEffect(() => {
@@ -28,18 +33,63 @@ export default function Home() {
   }, []);
 
   // แก้ไขการเรียก slots API
-  useEffect(() => {
-    if (!date || !selectedService) return;
+  const loadSlots = (d: string, serviceId: number) =>
     axios.get(`${API}/appointments/slots`, {
       params: {
-        d: date,
-        service_id: selectedService.id
+        d,
+        service_id: serviceId
       }
     })
-      .then(res => setSlots((res.data.slots || []).filter((s: Slot) => s.available)))
+      // ช่วงที่เรากันไว้เองแสดงเป็นไม่ว่างสำหรับคนอื่น แต่ยังต้องอยู่ในรายการของเรา
+      .then(res => setSlots((res.data.slots || []).filter((s: Slot) => s.available || isHeld(s, holdRef.current))
+        .map((s: Slot) => ({ ...s, available: true }))))
       .catch(() => setSlots([]));
+
+  // รับการเปลี่ยนแปลงของ slots แบบ real-time (SSE) แทนการ poll
+  // เปิด stream ก่อนแล้วค่อยโหลด slots เพื่อไม่ให้พลาดการจองที่เกิดระหว่างนั้น
+  useEffect(() => {
+    if (!date || !selectedService) return;
+    const serviceId = selectedService.id;
+    const es = new EventSource(`${API}/appointments/slots/stream?d=${date}&service_id=${serviceId}`);
+    const refresh = () => loadSlots(date, serviceId);
+    es.onopen = refresh;
+    ["booked", "released", "held", "changed", "resync"].forEach(type => es.addEventListener(type, refresh));
+    return () => es.close();
+  }, [date, selectedService]);
+
+  const releaseHold = () => {
+    const h = holdRef.current;
+    holdRef.current = null;
+    if (h) axios.delete(`${API}/appointments/holds/${h.token}`).catch(() => {});
+  };
+
+  // เปลี่ยนบริการหรือวันที่ = ไม่ใช้ช่วงที่กันไว้แล้ว
+  useEffect(() => {
+    setSelected(null);
+    releaseHold();
   }, [date, selectedService]);
 
+  // กันช่วงเวลาไว้ทันทีที่เลือก คนอื่นจะจองทับไม่ได้ระหว่างที่กรอกข้อมูล
+  const selectSlot = async (s: Slot) => {
+    if (!selectedService || isHeld(s, holdRef.current)) return;
+    releaseHold();
+    setSelected(s);
+    setMessage("");
+    try {
+      const res = await axios.post(`${API}/appointments/holds`, {
+        date, start_time: s.start, end_time: s.end, staff_id: s.staff_id, service_id: selectedService.id
+      });
+      holdRef.current = { token: res.data.token, start: s.start, staff_id: s.staff_id as number };
+    } catch (e: any) {
+      // มีคนกันหรือจองไปก่อน: ยังเลือกไว้ได้ การจองจะตรวจซ้ำอีกครั้ง
+      if (e?.response?.status === 400) {
+        setSelected(null);
+        setMessage(e.response.data?.detail || "ช่วงเวลานี้ไม่ว่างแล้ว");
+        loadSlots(date, selectedService.id);
+      }
+    }
+  };
+
   const canSubmit = useMemo(() => !!(date && selectedService && selected && name && phone), [date, selectedService, selected, name, phone]);
 
   const submit = async () => {
@@ -56,7 +106,9 @@ export default function Home() {
       status: "pending"
     };
     try {
-      const res = await axios.post(`${API}/appointments`, payload);
+      const hold = holdRef.current;
+      const res = await axios.post(`${API}/appointments`, payload, { params: hold ? { hold: hold.token } : {} });
+      holdRef.current = null;
       setBookingDetails({
         id: res.data.id,
         status: res.data.status,
@@ -68,13 +120,7 @@ export default function Home() {
       setShowSuccessModal(true);
       setSelected(null); setName(""); setPhone(""); setNote("");
       // refresh slots
-      const s = await axios.get(`${API}/appointments/slots`, {
-        params: {
-          d: date,
-          service_id: selectedService.id
-        }
-      });
-      setSlots((s.data.slots || []).filter((slot: Slot) => slot.available));
+      await loadSlots(date, selectedService.id);
     } catch(e: any) {
       setMessage(e?.response?.data?.detail || "เกิดข้อผิดพลาด");
     }
@@ -123,7 +169,7 @@ export default function Home() {
               <button key={i}
                 disabled={!s.available}
                 className={`selectable ${selected?.start === s.start ? "ring-2 ring-black" : ""} ${s.available ? "" : "opacity-50 cursor-not-allowed"}`}
-                onClick={() => s.available && setSelected(s)}>
+                onClick={() => s.available && selectSlot(s)}>
                 {s.start} - {s.end}
               </button>
             ))}